@@ -503,8 +503,7 @@ class ReceiptPDFAdmin(admin.ModelAdmin):
         request: HttpRequest,
         queryset: QuerySet[models.ReceiptPDF],
     ) -> None:
-        for pdf in queryset:
-            pdf.save_pdf()
+        models.ReceiptPDF.objects.save_pdfs(queryset)
 
     actions = (generate_pdf,)
 
@@ -521,6 +520,10 @@ class ReceiptValidationAdmin(admin.ModelAdmin):
 
     raw_id_fields = ("receipt",)
 
+    def get_queryset(self, request: HttpRequest) -> QuerySet:
+        # TYPING: django-stubs can't handle methods in querysets
+        return super().get_queryset(request).with_receipt()  # type: ignore[attr-defined]
+
     @admin.display(description=_("receipt number"), ordering="receipt_id")
     def receipt_number(self, obj: models.ReceiptValidation) -> str | None:
         return obj.receipt.formatted_number
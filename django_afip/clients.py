@@ -4,6 +4,7 @@ from functools import lru_cache
 from typing import TYPE_CHECKING
 from urllib.parse import urlparse
 
+from django.conf import settings
 from requests import Session
 from requests.adapters import HTTPAdapter
 from urllib3.util.ssl_ import create_urllib3_context
@@ -64,7 +65,8 @@ def get_or_create_transport() -> Transport:
     This transport does two non-default things:
     - Reduces TLS security. Sadly, AFIP only has insecure endpoints, so we're
       forced to reduce security to talk to them.
-    - Cache the WSDL file for a whole day.
+    - Cache the WSDL file for a whole day. The cache is stored in the path set by
+      the ``AFIP_WSDL_CACHE`` setting, or zeep's default location if unset.
 
     This function will only create a transport once, and return the same
     transport in subsequent calls.
@@ -79,7 +81,8 @@ def get_or_create_transport() -> Transport:
             base_url = f"{parsed.scheme}://{parsed.netloc}"
             session.mount(base_url, AFIPAdapter())
 
-    return Transport(cache=SqliteCache(timeout=86400), session=session)
+    cache = SqliteCache(path=getattr(settings, "AFIP_WSDL_CACHE", None), timeout=86400)
+    return Transport(cache=cache, session=session)
 
 
 @lru_cache(maxsize=32)
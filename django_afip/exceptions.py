@@ -9,7 +9,7 @@ class AfipException(DjangoAfipException):
     """Wraps around errors returned by AFIP's WS."""
 
     def __init__(self, response) -> None:  # noqa: ANN001
-        if "Errors" in response:
+        if getattr(response, "Errors", None):
             message = (
                 f"Error {response.Errors.Err[0].Code}: {response.Errors.Err[0].Msg}"
             )
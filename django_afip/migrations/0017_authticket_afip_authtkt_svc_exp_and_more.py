@@ -0,0 +1,28 @@
+# Generated by Django 5.1.7 on 2026-10-15 12:00
+from __future__ import annotations
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("afip", "0016_clientvatcondition_receipt_client_vat_condition"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="authticket",
+            index=models.Index(
+                fields=["service", "expires"],
+                name="afip_authtkt_svc_exp",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="authticket",
+            index=models.Index(
+                fields=["owner", "service", "expires"],
+                name="afip_authtkt_owner_svc_exp",
+            ),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.1.7 on 2026-10-15 12:00
+from __future__ import annotations
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("afip", "0017_authticket_afip_authtkt_svc_exp_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="receipt",
+            index=models.Index(
+                fields=["point_of_sales", "receipt_type", "issued_date", "id"],
+                name="afip_receipt_group_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-15 12:00
+from __future__ import annotations
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("afip", "0018_receipt_afip_receipt_group_idx"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="clientvatcondition",
+            name="code",
+            field=models.CharField(max_length=3, unique=True, verbose_name="code"),
+        ),
+    ]
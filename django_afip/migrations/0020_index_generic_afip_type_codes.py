@@ -0,0 +1,49 @@
+# Generated by Django 5.1.7 on 2026-10-15 12:00
+from __future__ import annotations
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("afip", "0019_alter_clientvatcondition_code"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="concepttype",
+            name="code",
+            field=models.CharField(db_index=True, max_length=3, verbose_name="code"),
+        ),
+        migrations.AlterField(
+            model_name="currencytype",
+            name="code",
+            field=models.CharField(db_index=True, max_length=3, verbose_name="code"),
+        ),
+        migrations.AlterField(
+            model_name="documenttype",
+            name="code",
+            field=models.CharField(db_index=True, max_length=3, verbose_name="code"),
+        ),
+        migrations.AlterField(
+            model_name="optionaltype",
+            name="code",
+            field=models.CharField(db_index=True, max_length=4, verbose_name="code"),
+        ),
+        migrations.AlterField(
+            model_name="receipttype",
+            name="code",
+            field=models.CharField(db_index=True, max_length=3, verbose_name="code"),
+        ),
+        migrations.AlterField(
+            model_name="taxtype",
+            name="code",
+            field=models.CharField(db_index=True, max_length=3, verbose_name="code"),
+        ),
+        migrations.AlterField(
+            model_name="vattype",
+            name="code",
+            field=models.CharField(db_index=True, max_length=3, verbose_name="code"),
+        ),
+    ]
@@ -1,11 +1,18 @@
 from __future__ import annotations
 
 import base64
+import functools
 import logging
 import os
 import random
 import re
 import warnings
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import wait
+from contextlib import contextmanager
+from datetime import date
 from datetime import datetime
 from datetime import timedelta
 from datetime import timezone
@@ -19,24 +26,30 @@ from typing import Generic
 from typing import TypeVar
 from uuid import uuid4
 
+from asgiref.sync import sync_to_async
+from cryptography import x509
 from django.conf import settings
 from django.core import management
 from django.core.files import File
 from django.core.validators import MinValueValidator
 from django.db import connection
 from django.db import models
+from django.db import router
+from django.db import transaction
+from django.db.models import Case
 from django.db.models import CheckConstraint
-from django.db.models import Count
+from django.db.models import ExpressionWrapper
 from django.db.models import F
+from django.db.models import Max
+from django.db.models import OuterRef
 from django.db.models import Q
+from django.db.models import Subquery
 from django.db.models import Sum
+from django.db.models import Value
+from django.db.models import When
 from django.utils.module_loading import import_string
 from django.utils.translation import gettext_lazy as _
 from lxml import etree
-from lxml.builder import E
-from OpenSSL.crypto import FILETYPE_PEM
-from OpenSSL.crypto import X509
-from OpenSSL.crypto import load_certificate
 from zeep.exceptions import Fault
 
 from django_afip.clients import TZ_AR
@@ -49,11 +62,20 @@ from . import parsers
 from . import serializers
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from concurrent.futures import Future
+
     from django.core.files.storage import Storage
+    from django.db.models import QuerySet
     from django.db.models.fields.files import FieldFile
+    from django.utils.functional import Promise
 
 logger = logging.getLogger(__name__)
 
+# Maximum amount of rows written per query when populating metadata. This keeps
+# statements (particularly bulk_update's CASE expressions) bounded in size.
+_POPULATE_BATCH_SIZE = 500
+
 # http://www.afip.gov.ar/afip/resol1415_anexo2.html
 VAT_CONDITIONS = (
     "IVA Responsable Inscripto",
@@ -81,16 +103,35 @@ CLIENT_VAT_CONDITIONS = (
 # Keys: ConceptType.code, Values: maximum days ago.
 RECEIPT_DATE_OFFSET = {"1": 5, "2": 14, "3": 14}
 
+# Matches the percentage in a VatType's description (e.g.: "10.5%").
+_VAT_RE = re.compile(r"^([0-9]{1,2}\.?[0-9]{0,2})%$")
+
 
 def load_metadata() -> None:
     """Loads metadata from fixtures into the database."""
 
-    for model in GenericAfipType.SUBCLASSES:
-        label = model._meta.label.split(".")[1].lower()
-        management.call_command("loaddata", label, app="afip")
+    # Load all fixtures at once, so they're loaded in a single transaction.
+    labels = [model._meta.model_name for model in GenericAfipType.SUBCLASSES]
+    labels.append(ClientVatCondition._meta.model_name)
+    management.call_command("loaddata", *labels, app="afip")
+
 
-    label = ClientVatCondition._meta.label.split(".")[1].lower()
-    management.call_command("loaddata", label, app="afip")
+@contextmanager
+def load_metadata_transaction() -> Iterator[None]:
+    """Commit all metadata populated within this block in a single transaction.
+
+    Each ``populate`` method otherwise commits its own writes. Refreshing all
+    metadata from AFIP's WS can be done with a single commit with::
+
+        with load_metadata_transaction():
+            for model in GenericAfipType.SUBCLASSES:
+                model.objects.populate(ticket)
+            ClientVatCondition.populate(ticket)
+
+    If any of them fails, none of the changes are saved.
+    """
+    with transaction.atomic(using=router.db_for_write(ClientVatCondition)):
+        yield
 
 
 def check_response(response) -> None:  # noqa: ANN001
@@ -105,25 +146,36 @@ def check_response(response) -> None:  # noqa: ANN001
     This method checks if responses have an error, and raise a readable
     message.
     """
-    if "Errors" in response:
-        if response.Errors:
-            raise exceptions.AfipException(response)
-    elif "errorConstancia" in response and response.errorConstancia:
+    # Plain attribute access is much cheaper than zeep's __contains__.
+    if getattr(response, "Errors", None):
+        raise exceptions.AfipException(response)
+    if getattr(response, "errorConstancia", None):
         raise exceptions.AfipException(response)
 
 
+@functools.lru_cache(maxsize=1)
+def _first_currency_pk() -> int:
+    # Raises when there is no such currency, so that misses are never cached.
+    pk = CurrencyType.objects.filter(code="PES").values_list("pk", flat=True).first()
+    if pk is None:
+        raise CurrencyType.DoesNotExist
+    return pk
+
+
 def first_currency() -> int | None:
     """Returns the id for the first currency
 
     The `default` parameter of a foreign key *MUST* be a primary key (and not
     an instance), else migrations break. This helper method exists solely for
     that purpose.
-    """
-    ct = CurrencyType.objects.filter(code="PES").first()
-    if ct:
-        return ct.pk
 
-    return None
+    The id is cached once found. The cache is cleared whenever a currency type is
+    saved or deleted.
+    """
+    try:
+        return _first_currency_pk()
+    except CurrencyType.DoesNotExist:
+        return None
 
 
 def _get_storage_from_settings(setting_name: str) -> Storage:
@@ -135,6 +187,21 @@ def _get_storage_from_settings(setting_name: str) -> Storage:
     return import_string(path)
 
 
+def _read_field_file(field_file: FieldFile) -> bytes:
+    """Return the entire contents of a file field.
+
+    The file is closed afterwards, unless it's a not-yet-saved upload, which can't be
+    re-opened once closed.
+    """
+    # TYPING: django-stubs doesn't declare this (undocumented) attribute.
+    if not field_file._committed:  # type: ignore[attr-defined]
+        field_file.open("rb")
+        return field_file.read()
+
+    with field_file.open("rb") as f:
+        return f.read()
+
+
 _T = TypeVar("_T", bound="GenericAfipType", covariant=True)
 
 
@@ -164,13 +231,27 @@ class GenericAfipTypeManager(models.Manager, Generic[_T]):
 
         check_response(response_xml)
 
-        for result in getattr(response_xml.ResultGet, self.__type_name):
-            self.get_or_create(
-                code=result.Id,
-                description=result.Desc,
-                valid_from=parsers.parse_date(result.FchDesde),
-                valid_to=parsers.parse_date_maybe(result.FchHasta),
-            )
+        results = list(getattr(response_xml.ResultGet, self.__type_name))
+        existing = set(
+            self.filter(
+                code__in=[result.Id for result in results],
+            ).values_list("code", flat=True)
+        )
+
+        self.bulk_create(
+            [
+                self.model(
+                    code=result.Id,
+                    description=result.Desc,
+                    valid_from=parsers.parse_date(result.FchDesde),
+                    valid_to=parsers.parse_date_maybe(result.FchHasta),
+                )
+                for result in results
+                # Some types have numeric codes, but we always store them as strings.
+                if str(result.Id) not in existing
+            ],
+            batch_size=_POPULATE_BATCH_SIZE,
+        )
 
     def get_by_natural_key(self, code: str) -> _T:
         return self.get(code=code)
@@ -199,6 +280,8 @@ class GenericAfipType(models.Model):
     code = models.CharField(
         _("code"),
         max_length=3,
+        # Natural keys (e.g.: when loading fixtures) are looked up by code.
+        db_index=True,
     )
     description = models.CharField(
         _("description"),
@@ -270,7 +353,7 @@ class VatType(GenericAfipType):
     See the AFIP's documentation for details on each VAT type.
     """
 
-    @property
+    @functools.cached_property
     def as_decimal(self) -> Decimal:
         """Return this VatType as a Decimal.
 
@@ -293,11 +376,13 @@ class VatType(GenericAfipType):
 
         Keep in mind that AFIP requires the usage of "round half even", which is what
         Python's ``Decimal`` class uses by default (See ``decimal.ROUND_HALF_EVEN``).
+
+        The value is cached on the instance after the first access.
         """
-        match = re.match(r"^([0-9]{1,2}\.?[0-9]{0,2})%$", self.description)
+        match = _VAT_RE.match(self.description)
         if not match:
             raise ValueError("The description for this VatType is not a percentage.")
-        return Decimal(match.groups()[0]) / 100
+        return Decimal(match.group(1)) / 100
 
     objects = GenericAfipTypeManager("FEParamGetTiposIva", "IvaTipo")
 
@@ -345,6 +430,7 @@ class OptionalType(GenericAfipType):
     code = models.CharField(
         _("code"),
         max_length=4,
+        db_index=True,
     )
 
     objects = GenericAfipTypeManager("FEParamGetTiposOpcional", "OpcionalTipo")
@@ -437,25 +523,44 @@ class TaxPayer(models.Model):
 
         This can be used to embed the image into an HTML or PDF file.
         """
-        _, ext = os.path.splitext(self.logo.file.name)
+        # TYPING: name is only None if there's no logo, and opening it fails then.
+        name: str = self.logo.name  # type: ignore[assignment]
+        _, ext = os.path.splitext(name)
         with self.logo.open() as f:
             data = base64.b64encode(f.read())
 
         image_fmt = ext[1:]  # Remove the leading dot.
         return f"data:image/{image_fmt};base64,{data.decode()}"
 
+    @functools.cached_property
+    def certificate_bytes(self) -> bytes:
+        """The raw contents of the certificate file.
+
+        The value is cached for the lifetime of this instance (or until it is saved),
+        to avoid hitting the storage backend each time a ticket is requested.
+        """
+        return _read_field_file(self.certificate)
+
+    @functools.cached_property
+    def key_bytes(self) -> bytes:
+        """The raw contents of the key file.
+
+        The value is cached for the lifetime of this instance (or until it is saved),
+        to avoid hitting the storage backend each time a ticket is requested.
+        """
+        return _read_field_file(self.key)
+
     @property
-    def certificate_object(self) -> X509 | None:
-        """Returns the certificate as an OpenSSL object
+    def certificate_object(self) -> x509.Certificate | None:
+        """Returns the certificate as a ``cryptography`` object
 
-        Returns the certificate as an OpenSSL object (rather than as a file
-        object).
+        Returns the certificate as a :class:`cryptography.x509.Certificate`
+        (rather than as a file object).
         """
 
         if not self.certificate:
             return None
-        self.certificate.seek(0)
-        return load_certificate(FILETYPE_PEM, self.certificate.read())
+        return x509.load_pem_x509_certificate(self.certificate_bytes)
 
     def get_certificate_expiration(self) -> datetime | None:
         """Return the certificate expiration from the current certificate
@@ -468,12 +573,8 @@ class TaxPayer(models.Model):
         cert = self.certificate_object
         if not cert:
             return None
-        not_after = cert.get_notAfter()
-        if not not_after:
-            return None
-        datestring = not_after.decode()
-        dt = datetime.strptime(datestring, "%Y%m%d%H%M%SZ")
-        return dt.replace(tzinfo=timezone.utc)
+        # cryptography returns a naive datetime, which is always in UTC.
+        return cert.not_valid_after.replace(tzinfo=timezone.utc)
 
     def generate_key(self, force: bool = False) -> bool:
         """Creates a key file for this TaxPayer
@@ -562,7 +663,9 @@ class TaxPayer(models.Model):
         Fetch all point of sales from the WS and store (or update) them
         locally.
 
-        Returns a list of tuples with the format ``(pos, created,)``.
+        Returns a list of tuples with the format ``(pos, created,)``. Updated
+        instances only have the fields relevant to AFIP loaded; any others are
+        deferred.
         """
         ticket = ticket or self.get_or_create_ticket("wsfe")
 
@@ -572,12 +675,23 @@ class TaxPayer(models.Model):
         )
         check_response(response)
 
-        results = []
-
+        # Only load the fields that we compare; the issuing_* fields may be large.
         existing_pos_dict = {
-            pos.number: pos for pos in PointOfSales.objects.filter(owner=self)
+            pos.number: pos
+            for pos in PointOfSales.objects.filter(owner=self).only(
+                "number",
+                "issuance_type",
+                "blocked",
+                "drop_date",
+                "owner_id",
+            )
         }
 
+        to_update = []
+        to_create = []
+        # Primary keys of updated points of sales, grouped by (field, new value).
+        changes: defaultdict[tuple[str, object], list[int]] = defaultdict(list)
+
         for pos_data in response.ResultGet.PtoVenta:
             pos_number = pos_data.Nro
             issuance_type = pos_data.EmisionTipo
@@ -591,27 +705,56 @@ class TaxPayer(models.Model):
 
                 if pos.issuance_type != issuance_type:
                     pos.issuance_type = issuance_type
+                    changes["issuance_type", issuance_type].append(pos.pk)
                     is_modified = True
                 if pos.blocked != is_blocked:
                     pos.blocked = is_blocked
+                    changes["blocked", is_blocked].append(pos.pk)
                     is_modified = True
                 elif pos.drop_date != drop_date:
                     pos.drop_date = drop_date
+                    changes["drop_date", drop_date].append(pos.pk)
                     is_modified = True
 
                 if is_modified:
-                    pos.save()
-                    results.append((pos, False))
+                    to_update.append(pos)
             elif not is_blocked:
-                pos = PointOfSales.objects.create(
+                to_create.append(
+                    PointOfSales(
+                        owner=self,
+                        number=pos_data.Nro,
+                        issuance_type=issuance_type,
+                    )
+                )
+
+        # Changes usually touch a single field and share values (e.g.: several points
+        # of sales getting blocked), so a few plain UPDATEs cover them all.
+        for (field, value), pks in changes.items():
+            PointOfSales.objects.filter(pk__in=pks).update(**{field: value})
+        created = PointOfSales.objects.bulk_create(to_create)
+        if created and not connection.features.can_return_rows_from_bulk_insert:
+            # Some backends (e.g.: MySQL) don't set primary keys for bulk-created
+            # objects, so fetch the new rows back.
+            saved = {
+                pos.number: pos
+                for pos in PointOfSales.objects.filter(
                     owner=self,
-                    number=pos_data.Nro,
-                    issuance_type=issuance_type,
+                    number__in=[pos.number for pos in created],
                 )
-                results.append((pos, True))
+            }
+            created = [saved[pos.number] for pos in created]
+
+        results = [(pos, False) for pos in to_update]
+        results.extend((pos, True) for pos in created)
 
         return results
 
+    def save(self, *args, **kwargs) -> None:
+        # The files may have been replaced, so drop any cached contents.
+        self.__dict__.pop("certificate_bytes", None)
+        self.__dict__.pop("key_bytes", None)
+        super().save(*args, **kwargs)
+
     def __repr__(self) -> str:
         return f"<TaxPayer {self.pk}: {self.name}, CUIT {self.cuit}>"
 
@@ -722,6 +865,15 @@ class PointOfSales(models.Model):
         ),
     )
 
+    @functools.cached_property
+    def formatted_prefix(self) -> str:
+        """This point of sales' number as used in receipt numbers: ``0001``.
+
+        This is computed once per instance, since receipts from the same point of
+        sales share it.
+        """
+        return f"{self.number:04d}"
+
     def __str__(self) -> str:
         return str(self.number)
 
@@ -734,15 +886,21 @@ class PointOfSales(models.Model):
 class AuthTicketManager(models.Manager["AuthTicket"]):
     def get_any_active(self, service: str) -> AuthTicket:
         """Return a valid, active ticket for a given service."""
-        ticket = AuthTicket.objects.filter(
-            token__isnull=False,
-            expires__gt=datetime.now(timezone.utc),
-            service=service,
-        ).first()
+        # Tickets are always serialized, which requires the owner's CUIT.
+        ticket = (
+            AuthTicket.objects.filter(
+                token__isnull=False,
+                expires__gt=datetime.now(timezone.utc),
+                service=service,
+            )
+            .select_related("owner")
+            .first()
+        )
         if ticket:
             return ticket
 
-        taxpayer = TaxPayer.objects.order_by("?").first()
+        # Any taxpayer will do; avoid ORDER BY RANDOM(), which sorts the whole table.
+        taxpayer = TaxPayer.objects.order_by("pk").first()
 
         if not taxpayer:
             raise exceptions.AuthenticationError(
@@ -815,30 +973,31 @@ class AuthTicket(models.Model):
     TOKEN_XPATH = "/loginTicketResponse/credentials/token"
     SIGN_XPATH = "/loginTicketResponse/credentials/sign"
 
+    # Compiled once, since they're evaluated on every authorization.
+    _TOKEN_XP = etree.XPath(f"{TOKEN_XPATH}/text()")
+    _SIGN_XP = etree.XPath(f"{SIGN_XPATH}/text()")
+
     def __create_request_xml(self) -> bytes:
         """Create a new ticket request XML
 
         This is the payload we sent to AFIP to request a new ticket."""
-        request_xml = E.loginTicketRequest(
-            {"version": "1.0"},
-            E.header(
-                E.uniqueId(str(self.unique_id)),
-                E.generationTime(serializers.serialize_datetime(self.generated)),
-                E.expirationTime(serializers.serialize_datetime(self.expires)),
-            ),
-            E.service(self.service),
-        )
+        request_xml = etree.Element("loginTicketRequest", version="1.0")
+        header = etree.SubElement(request_xml, "header")
+        etree.SubElement(header, "uniqueId").text = str(self.unique_id)
+        generated = serializers.serialize_datetime(self.generated)
+        expires = serializers.serialize_datetime(self.expires)
+        etree.SubElement(header, "generationTime").text = generated
+        etree.SubElement(header, "expirationTime").text = expires
+        etree.SubElement(request_xml, "service").text = self.service
         # Hint: tostring returns bytes.
-        return etree.tostring(request_xml, pretty_print=True)
+        return etree.tostring(request_xml)
 
     def __sign_request(self, request: bytes) -> bytes:
-        with self.owner.certificate.file.open("rb") as f:
-            cert = f.read()
-
-        with self.owner.key.file.open("rb") as f:
-            key = f.read()
-
-        return crypto.create_embeded_pkcs7_signature(request, cert, key)
+        return crypto.create_embeded_pkcs7_signature(
+            request,
+            self.owner.certificate_bytes,
+            self.owner.key_bytes,
+        )
 
     def authorize(self) -> None:
         """Send this ticket to AFIP for authorization."""
@@ -857,8 +1016,9 @@ class AuthTicket(models.Model):
             raise exceptions.AuthenticationError(str(e)) from e
         response = etree.fromstring(raw_response.encode("utf-8"))
 
-        self.token = response.xpath(self.TOKEN_XPATH)[0].text
-        self.signature = response.xpath(self.SIGN_XPATH)[0].text
+        # Text results are bound to their tree; use plain strings to allow freeing it.
+        self.token = str(self._TOKEN_XP(response)[0])
+        self.signature = str(self._SIGN_XP(response)[0])
 
         self.save()
 
@@ -871,6 +1031,78 @@ class AuthTicket(models.Model):
     class Meta:
         verbose_name = _("authorization ticket")
         verbose_name_plural = _("authorization tickets")
+        indexes = (
+            models.Index(
+                fields=["service", "expires"],
+                name="afip_authtkt_svc_exp",
+            ),
+            models.Index(
+                fields=["owner", "service", "expires"],
+                name="afip_authtkt_owner_svc_exp",
+            ),
+        )
+
+
+def _save_validations(
+    validations: list[ReceiptValidation],
+    observations: list[tuple[ReceiptValidation, list]],
+) -> None:
+    """Save new validations, along with any observations returned by AFIP.
+
+    ``observations`` is a list of ``(validation, observations)`` tuples, where
+    ``observations`` are the ``Obs`` objects from AFIP's response.
+    """
+    ReceiptValidation.objects.bulk_create(validations)
+    if validations and not connection.features.can_return_rows_from_bulk_insert:
+        # Some backends (e.g.: MySQL) don't set primary keys for bulk-created objects.
+        # Callers (and linking observations) need them, so fetch them back.
+        validation_pks = dict(
+            ReceiptValidation.objects.filter(
+                receipt_id__in=[v.receipt_id for v in validations],
+            ).values_list("receipt_id", "pk")
+        )
+        for validation in validations:
+            validation.pk = validation_pks[validation.receipt_id]
+
+    if not observations:
+        return
+
+    # (validation pk, (code, message)) pairs. AFIP might repeat an observation.
+    links = {
+        (validation.pk, (obs.Code, obs.Msg))
+        for validation, obs_list in observations
+        for obs in obs_list
+    }
+    keys = {key for _, key in links}
+
+    # Reuse existing observations (like Receipt.revalidate does), and only create
+    # the missing ones.
+    existing = {
+        (observation.code, observation.message): observation
+        for observation in Observation.objects.filter(
+            code__in={code for code, _ in keys},
+        )
+    }
+    missing = [
+        Observation(code=code, message=message)
+        for code, message in keys
+        if (code, message) not in existing
+    ]
+    if connection.features.can_return_rows_from_bulk_insert:
+        Observation.objects.bulk_create(missing)
+    else:
+        for observation in missing:
+            observation.save()
+    existing.update(
+        ((observation.code, observation.message), observation)
+        for observation in missing
+    )
+
+    through = ReceiptValidation.observations.through
+    through.objects.bulk_create(
+        through(receiptvalidation_id=pk, observation_id=existing[key].pk)
+        for pk, key in links
+    )
 
 
 class ReceiptQuerySet(models.QuerySet):
@@ -880,32 +1112,132 @@ class ReceiptQuerySet(models.QuerySet):
     # Inspired by Django's flag of the same name for `Atomic`.
     _ensure_durability = True
 
-    def _assign_numbers(self) -> None:
+    def _assign_numbers(self, ticket: AuthTicket | None = None) -> None:
         """Assign numbers in preparation for validating these receipts.
 
+        If ``ticket`` is given, it is used for all receipts. Otherwise, a ticket is
+        fetched once for each owner.
+
         WARNING: Don't call the method manually unless you know what you're
         doing!
         """
-        first = self.select_related("point_of_sales", "receipt_type").first()
-        assert first is not None  # should never happen; mostly a hint for mypy
+        # fetch_last_receipt_number accesses the owner (for its sandbox mode) and
+        # the receipt type's code, so fetch those in the same query.
+        # TYPING: django-stubs doesn't know the model of custom querysets.
+        unnumbered: list[Receipt] = list(
+            self.filter(  # type: ignore[arg-type]
+                receipt_number__isnull=True,
+            ).select_related("point_of_sales__owner", "receipt_type"),
+        )
 
-        next_num = (
-            Receipt.objects.fetch_last_receipt_number(
-                first.point_of_sales,
-                first.receipt_type,
+        # Each point of sales and receipt type has its own sequence of numbers:
+        groups: defaultdict[tuple[int, int], list[Receipt]] = defaultdict(list)
+        for receipt in unnumbered:
+            groups[(receipt.point_of_sales_id, receipt.receipt_type_id)].append(receipt)
+
+        tickets: dict[int, AuthTicket] = {}
+        numbers: dict[int, int] = {}
+        for receipts in groups.values():
+            owner = receipts[0].point_of_sales.owner
+            if ticket is None and owner.pk not in tickets:
+                tickets[owner.pk] = owner.get_or_create_ticket("wsfe")
+            last_number = Receipt.objects.fetch_last_receipt_number(
+                receipts[0].point_of_sales,
+                receipts[0].receipt_type,
+                ticket=ticket or tickets[owner.pk],
             )
-            + 1
+            for number, receipt in enumerate(receipts, start=last_number + 1):
+                numbers[receipt.pk] = number
+
+        if not numbers:
+            return
+
+        # Atomically assign sequential numbers to all receipts in a single query.
+        Receipt.objects.filter(
+            pk__in=numbers,
+            receipt_number__isnull=True,
+        ).update(
+            receipt_number=Case(
+                *(When(pk=pk, then=Value(num)) for pk, num in numbers.items()),
+            ),
         )
 
-        for receipt in self.filter(receipt_number__isnull=True):
-            # Atomically update receipt number
-            Receipt.objects.filter(
-                pk=receipt.id,
-                receipt_number__isnull=True,
-            ).update(
-                receipt_number=next_num,
+    def with_totals(self) -> ReceiptQuerySet:
+        """Annotate receipts with the total amount of their VATs and taxes.
+
+        :attr:`~.Receipt.total_vat` and :attr:`~.Receipt.total_tax` use these values
+        instead of querying the database for each receipt.
+        """
+
+        def total(model: type[Tax | Vat]) -> Subquery:
+            # Use subqueries; joining both relations would multiply their rows.
+            return Subquery(
+                model.objects.filter(receipt=OuterRef("pk"))
+                .order_by()
+                .values("receipt")
+                .annotate(total=Sum("amount"))
+                .values("total")
             )
-            next_num += 1
+
+        return self.annotate(_total_vat=total(Vat), _total_tax=total(Tax))
+
+    def approximate_dates(self) -> int:
+        """Approximate the dates of all unnumbered receipts in this queryset.
+
+        This is the equivalent of calling :meth:`~.Receipt.approximate_date` on each
+        receipt, but uses a fixed amount of queries regardless of how many receipts
+        there are. Receipts that already have a number are skipped.
+
+        Returns the amount of receipts whose date has been changed.
+        """
+        today = datetime.now(TZ_AR).date()
+
+        receipts = list(
+            self.filter(receipt_number__isnull=True)
+            .exclude(issued_date=today)
+            .order_by()
+            .values_list(
+                "pk",
+                "point_of_sales_id",
+                "receipt_type_id",
+                "issued_date",
+                "concept__code",
+            )
+        )
+        if not receipts:
+            return 0
+
+        most_recent = {
+            (pos, receipt_type): issued_date
+            for pos, receipt_type, issued_date in Receipt.objects.filter(
+                point_of_sales_id__in={r[1] for r in receipts},
+                receipt_type_id__in={r[2] for r in receipts},
+                validation__result=ReceiptValidation.RESULT_APPROVED,
+            )
+            .order_by()
+            .values_list("point_of_sales_id", "receipt_type_id")
+            .annotate(Max("issued_date"))
+        }
+
+        new_dates = {}
+        for pk, pos, receipt_type, issued_date, concept in receipts:
+            oldest_possible = today - timedelta(days=RECEIPT_DATE_OFFSET[str(concept)])
+            if (pos, receipt_type) in most_recent:
+                oldest_possible = max(most_recent[pos, receipt_type], oldest_possible)
+            if issued_date < oldest_possible:
+                new_dates[pk] = oldest_possible
+
+        if not new_dates:
+            return 0
+
+        return Receipt.objects.filter(
+            pk__in=new_dates,
+            receipt_number__isnull=True,
+        ).update(
+            issued_date=Case(
+                *(When(pk=pk, then=Value(d)) for pk, d in new_dates.items()),
+            ),
+        )
 
     def check_groupable(self) -> ReceiptQuerySet:
         """Check that all receipts returned by this queryset are groupable.
@@ -916,14 +1248,14 @@ class ReceiptQuerySet(models.QuerySet):
         Returns the same queryset is all receipts are groupable, otherwise,
         raises :class:`~.CannotValidateTogether`.
         """
-        types = self.aggregate(
-            poses=Count(
-                "point_of_sales_id",
-            ),
-            types=Count("receipt_type"),
+        # Fetching two distinct pairs is enough to know that there's more than one.
+        groups = (
+            self.order_by()
+            .values_list("point_of_sales_id", "receipt_type_id")
+            .distinct()[:2]
         )
 
-        if set(types.values()) > {1}:
+        if len(groups) > 1:
             raise exceptions.CannotValidateTogether
 
         return self
@@ -971,55 +1303,180 @@ class ReceiptQuerySet(models.QuerySet):
         fatal interruptions. In particular, the receipt numbers will not have been
         saved, so it would be impossible to recover from the incomplete operation.
         """
+        errs, _ = self._validate(ticket)
+        return errs
+
+    def _validate(
+        self,
+        ticket: AuthTicket | None = None,
+    ) -> tuple[list[str], dict[int, tuple[int, ReceiptValidation]]]:
+        """Validate receipts, as documented in :meth:`~.ReceiptQuerySet.validate`.
+
+        Returns the errors from AFIP, and the approved validations, keyed by the
+        receipts' pk, along with the number assigned to each receipt.
+        """
         if self._ensure_durability and connection.in_atomic_block:
             raise RuntimeError("This function cannot be called within a transaction")
 
         # Skip any already-validated ones:
         qs = self.filter(validation__isnull=True).check_groupable()
 
-        # Return early if queryset is empty:
-        first = qs.first()
-        if first is None:
-            return []
-
-        qs.order_by("issued_date", "id")._assign_numbers()
-
-        ticket = ticket or first.point_of_sales.owner.get_or_create_ticket("wsfe")
-        client = clients.get_client("wsfe", first.point_of_sales.owner.is_sandboxed)
+        # Only the owner is needed from here on, so fetch just that (rather than a
+        # whole receipt). Return early if queryset is empty:
+        owner = TaxPayer.objects.filter(points_of_sales__receipts__in=qs).first()
+        if owner is None:
+            return [], {}
+
+        ticket = ticket or owner.get_or_create_ticket("wsfe")
+        qs.order_by("issued_date", "id")._assign_numbers(ticket)
+
+        client = clients.get_client("wsfe", owner.is_sandboxed)
+        # Fetch everything the serializer touches up-front, rather than once per
+        # receipt:
+        to_serialize = qs.select_related(
+            "concept",
+            "document_type",
+            "client_vat_condition",
+        ).prefetch_related(
+            "vat__vat_type",
+            "taxes__tax_type",
+            "optionals__optional_type",
+            "related_receipts",
+        )
         response = client.service.FECAESolicitar(
             serializers.serialize_ticket(ticket),
-            serializers.serialize_multiple_receipts(qs),
+            serializers.serialize_multiple_receipts(to_serialize),
         )
         check_response(response)
+
+        pks_by_number = dict(qs.values_list("receipt_number", "pk"))
+        processed_date = parsers.parse_datetime(response.FeCabResp.FchProceso)
+        # Receipts in a batch usually share the same expiration date; parse it once.
+        cae_expirations: dict[str, date] = {}
+
         errs = []
+        validations = []
+        observations = []
         for cae_data in response.FeDetResp.FECAEDetResponse:
             if cae_data.Resultado == ReceiptValidation.RESULT_APPROVED:
-                validation = ReceiptValidation.objects.create(
+                if cae_data.CAEFchVto not in cae_expirations:
+                    cae_expirations[cae_data.CAEFchVto] = parsers.parse_date(
+                        cae_data.CAEFchVto
+                    )
+                validation = ReceiptValidation(
                     result=cae_data.Resultado,
                     cae=cae_data.CAE,
-                    cae_expiration=parsers.parse_date(cae_data.CAEFchVto),
-                    receipt=qs.get(
-                        receipt_number=cae_data.CbteDesde,
-                    ),
-                    processed_date=parsers.parse_datetime(
-                        response.FeCabResp.FchProceso,
-                    ),
+                    cae_expiration=cae_expirations[cae_data.CAEFchVto],
+                    receipt_id=pks_by_number[cae_data.CbteDesde],
+                    processed_date=processed_date,
                 )
+                validations.append(validation)
                 if cae_data.Observaciones:
-                    for obs in cae_data.Observaciones.Obs:
-                        observation = Observation.objects.create(
-                            code=obs.Code,
-                            message=obs.Msg,
-                        )
-                    validation.observations.add(observation)
+                    observations.append((validation, cae_data.Observaciones.Obs))
             elif cae_data.Observaciones:
                 for obs in cae_data.Observaciones.Obs:
                     errs.append(f"Error {obs.Code}: {parsers.parse_string(obs.Msg)}")
 
+        _save_validations(validations, observations)
+
+        # Return approved validations too, so that Receipt.validate can update its
+        # instance without re-fetching it. Maps pks to (number, validation) tuples.
+        numbers_by_pk = {pk: number for number, pk in pks_by_number.items()}
+        validated = {
+            v.receipt_id: (numbers_by_pk[v.receipt_id], v) for v in validations
+        }
+
         # Remove the number from ones that failed to validate:
-        qs.filter(validation__isnull=True).update(receipt_number=None)
+        failed_pks = set(pks_by_number.values()) - validated.keys()
+        if failed_pks:
+            Receipt.objects.filter(pk__in=failed_pks).update(receipt_number=None)
 
-        return errs
+        return errs, validated
+
+    async def avalidate(self, ticket: AuthTicket | None = None) -> list[str]:
+        """Asynchronous version of :meth:`~.ReceiptQuerySet.validate`.
+
+        Validation runs in a separate thread, with its own database connection. This
+        allows validating several batches (e.g.: one per point of sales) concurrently
+        using :func:`asyncio.gather`, so that database writes for one of them overlap
+        with requests to AFIP for the others.
+
+        Like :meth:`~.ReceiptQuerySet.validate`, this cannot be called within a
+        transaction.
+        """
+
+        def validate() -> list[str]:
+            try:
+                return self.validate(ticket)
+            finally:
+                connection.close()
+
+        return await sync_to_async(validate, thread_sensitive=False)()
+
+    def revalidate(self, max_workers: int = 16) -> list[ReceiptValidation]:
+        """Fetch validation data from AFIP's servers for all matching receipts.
+
+        This is the equivalent of calling :meth:`~.Receipt.revalidate` on each
+        receipt, except that data for all receipts is fetched concurrently (using
+        up to ``max_workers`` threads), and new validations are saved in bulk.
+
+        Receipts that are already validated or have no number are ignored.
+
+        Returns the list of newly created :class:`~.ReceiptValidation` instances.
+        """
+        # TYPING: django-stubs doesn't know the model of custom querysets.
+        receipts: list[Receipt] = list(
+            self.filter(  # type: ignore[arg-type]
+                validation__isnull=True,
+                receipt_number__isnull=False,
+            ).select_related("point_of_sales__owner"),
+        )
+
+        # Get tickets upfront, so that workers can share them and don't race to
+        # create them.
+        tickets: dict[int, AuthTicket] = {}
+        for receipt in receipts:
+            owner = receipt.point_of_sales.owner
+            if owner.pk not in tickets:
+                tickets[owner.pk] = owner.get_or_create_ticket("wsfe")
+
+        def fetch(receipt: Receipt):  # noqa: ANN202
+            try:
+                return Receipt.objects.fetch_receipt_data(
+                    receipt.receipt_type.code,
+                    # TYPING: receipts without a number have been filtered out.
+                    receipt.receipt_number,  # type: ignore[arg-type]
+                    receipt.point_of_sales,
+                    ticket=tickets[receipt.point_of_sales.owner_id],
+                )
+            finally:
+                # Each thread has its own connection, which must not be left open.
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(fetch, receipts))
+
+        validations = []
+        observations = []
+        for receipt, receipt_data in zip(receipts, results):
+            if not receipt_data:
+                continue
+            if receipt_data.Resultado != ReceiptValidation.RESULT_APPROVED:
+                continue
+            validation = ReceiptValidation(
+                result=receipt_data.Resultado,
+                cae=receipt_data.CodAutorizacion,
+                cae_expiration=parsers.parse_date(receipt_data.FchVto),
+                receipt=receipt,
+                processed_date=parsers.parse_datetime(receipt_data.FchProceso),
+            )
+            validations.append(validation)
+            if receipt_data.Observaciones:
+                observations.append((validation, receipt_data.Observaciones.Obs))
+
+        _save_validations(validations, observations)
+
+        return validations
 
 
 class ReceiptManager(models.Manager):
@@ -1032,13 +1489,17 @@ class ReceiptManager(models.Manager):
         self,
         point_of_sales: PointOfSales,
         receipt_type: ReceiptType,
+        ticket: AuthTicket | None = None,
     ) -> int:
-        """Returns the number for the last validated receipt."""
-        client = clients.get_client("wsfe", point_of_sales.owner.is_sandboxed)
+        """Returns the number for the last validated receipt.
+
+        If no ``ticket`` is given, one is fetched for the point of sales' owner.
+        """
+        owner = point_of_sales.owner
+        client = clients.get_client("wsfe", owner.is_sandboxed)
+        ticket = ticket or owner.get_or_create_ticket("wsfe")
         response_xml = client.service.FECompUltimoAutorizado(
-            serializers.serialize_ticket(
-                point_of_sales.owner.get_or_create_ticket("wsfe")
-            ),
+            serializers.serialize_ticket(ticket),
             point_of_sales.number,
             receipt_type.code,
         )
@@ -1066,17 +1527,21 @@ class ReceiptManager(models.Manager):
         receipt_type: str,
         receipt_number: int,
         point_of_sales: PointOfSales,
+        ticket: AuthTicket | None = None,
     ):  # TODO: Wrap this in a dataclass
-        """Returns receipt related data"""
+        """Returns receipt related data
+
+        If no ``ticket`` is given, one is fetched for the point of sales' owner.
+        """
 
         if not receipt_number:
             return None
 
-        client = clients.get_client("wsfe", point_of_sales.owner.is_sandboxed)
+        owner = point_of_sales.owner
+        client = clients.get_client("wsfe", owner.is_sandboxed)
+        ticket = ticket or owner.get_or_create_ticket("wsfe")
         response_xml = client.service.FECompConsultar(
-            serializers.serialize_ticket(
-                point_of_sales.owner.get_or_create_ticket("wsfe")
-            ),
+            serializers.serialize_ticket(ticket),
             serializers.serialize_receipt_data(
                 receipt_type, receipt_number, point_of_sales.number
             ),
@@ -1090,11 +1555,24 @@ class ReceiptManager(models.Manager):
     def get_queryset(self) -> ReceiptQuerySet:
         """Return a new QuerySet object.
 
-        This always joins with :class:`~.ReceiptType`."""
+        This always joins with :class:`~.ReceiptType`, :class:`~.CurrencyType`, and
+        the :class:`~.PointOfSales` and its owner, which are needed for most
+        operations on receipts."""
         return ReceiptQuerySet(self.model, using=self._db).select_related(
             "receipt_type",
+            "point_of_sales__owner",
+            "currency",
         )
 
+    def with_validation(self) -> ReceiptQuerySet:
+        """Return receipts joined with their validation.
+
+        Use this when calling :meth:`~.Receipt.revalidate` (or checking
+        :attr:`~.Receipt.is_validated`) on many receipts, to avoid a query for each
+        of them.
+        """
+        return self.get_queryset().select_related("validation")
+
 
 class Receipt(models.Model):
     """A receipt, as sent to AFIP.
@@ -1257,13 +1735,23 @@ class Receipt(models.Model):
 
     @property
     def total_vat(self) -> int:
-        """Returns the sum of all Vat objects."""
+        """Returns the sum of all Vat objects.
+
+        Uses the value annotated by :meth:`~.ReceiptQuerySet.with_totals` if present.
+        """
+        if hasattr(self, "_total_vat"):
+            return self._total_vat or 0
         q = Vat.objects.filter(receipt=self).aggregate(total=Sum("amount"))
         return q["total"] or 0
 
     @property
     def total_tax(self) -> int:
-        """Returns the sum of all Tax objects."""
+        """Returns the sum of all Tax objects.
+
+        Uses the value annotated by :meth:`~.ReceiptQuerySet.with_totals` if present.
+        """
+        if hasattr(self, "_total_tax"):
+            return self._total_tax or 0
         q = Tax.objects.filter(receipt=self).aggregate(total=Sum("amount"))
         return q["total"] or 0
 
@@ -1271,7 +1759,7 @@ class Receipt(models.Model):
     def formatted_number(self) -> str | None:
         """This receipt's number in the usual format: ``0001-00003087``."""
         if self.receipt_number:
-            return f"{self.point_of_sales.number:04d}-{self.receipt_number:08d}"
+            return f"{self.point_of_sales.formatted_prefix}-{self.receipt_number:08d}"
         return None
 
     @property
@@ -1328,10 +1816,14 @@ class Receipt(models.Model):
         # See: https://github.com/typeddjango/django-stubs/issues/1067
         qs = Receipt.objects.filter(pk=self.pk)
         assert isinstance(qs, ReceiptQuerySet)  # required for mypy
-        rv = qs.validate(ticket)
+        rv, validations = qs._validate(ticket)
         # Since we're operating via a queryset, this instance isn't properly
-        # updated:
-        self.refresh_from_db()
+        # updated. If it was approved, update it in-place; otherwise re-fetch it.
+        validated = validations.get(self.pk)
+        if validated:
+            self.receipt_number, self.validation = validated
+        else:
+            self.refresh_from_db()
         if raise_ and rv:
             raise exceptions.ValidationError(rv[0])
         return rv
@@ -1350,11 +1842,13 @@ class Receipt(models.Model):
 
         Any new validation data is persisted into the database before returning.
         """
-        # This may avoid unnecessary revalidation
-        if self.is_validated:
-            return self.validation
         if not self.receipt_number:
             return None
+        # This may avoid unnecessary revalidation. Accessing the validation needs no
+        # query if it was fetched with select_related (see ``with_validation``).
+        validation = getattr(self, "validation", None)
+        if validation and validation.result == ReceiptValidation.RESULT_APPROVED:
+            return validation
 
         receipt_data = Receipt.objects.fetch_receipt_data(
             self.receipt_type.code, self.receipt_number, self.point_of_sales
@@ -1374,12 +1868,15 @@ class Receipt(models.Model):
                 ),
             )
             if receipt_data.Observaciones:
-                for obs in receipt_data.Observaciones.Obs:
-                    observation, _ = Observation.objects.get_or_create(
-                        code=obs.Code,
-                        message=obs.Msg,
+                validation.observations.add(
+                    *(
+                        Observation.objects.get_or_create(
+                            code=obs.Code,
+                            message=obs.Msg,
+                        )[0]
+                        for obs in receipt_data.Observaciones.Obs
                     )
-                validation.observations.add(observation)
+                )
             return validation
         return None
 
@@ -1460,10 +1957,16 @@ class Receipt(models.Model):
         verbose_name = _("receipt")
         verbose_name_plural = _("receipts")
         unique_together = ("point_of_sales", "receipt_type", "receipt_number")
-        # TODO: index_together...
+        indexes = (
+            # Receipts are validated in groups, ordered by date.
+            models.Index(
+                fields=["point_of_sales", "receipt_type", "issued_date", "id"],
+                name="afip_receipt_group_idx",
+            ),
+        )
 
 
-class ReceiptPDFManager(models.Manager):
+class ReceiptPDFManager(models.Manager["ReceiptPDF"]):
     def create_for_receipt(self, receipt: Receipt, **kwargs) -> ReceiptPDF:
         """Creates a ReceiptPDF object for a given receipt.
 
@@ -1495,6 +1998,68 @@ class ReceiptPDFManager(models.Manager):
             **kwargs,
         )
 
+    def save_pdfs(
+        self,
+        queryset: QuerySet[ReceiptPDF] | None = None,
+        builder: PdfBuilder | None = None,
+        max_workers: int = 8,
+    ) -> None:
+        """Generate and save the PDF files for multiple instances.
+
+        A single builder is shared for all files, rather than creating one for
+        each of them. Files are rendered one at a time, and each one is uploaded to
+        storage (using up to ``max_workers`` threads) while the next ones render. At
+        most ``max_workers`` rendered files are kept in memory at any time. All
+        instances are then updated with a single query.
+
+        If rendering or uploading any file fails, instances for files which were
+        already uploaded are still updated, and the exception is then re-raised.
+
+        :param queryset: The instances for which to generate files. If ``None``,
+            files are generated for all instances.
+        :param builder: A custom pdf builder to use. If ``None`` is provided, the
+            default :class:`~.PdfBuilder` is used.
+        :param max_workers: The maximum amount of concurrent uploads.
+        """
+        queryset = self.all() if queryset is None else queryset
+        builder = builder or PdfBuilder()
+
+        uploaded: list[ReceiptPDF] = []
+
+        def upload(pdf: ReceiptPDF) -> None:
+            rendered = pdf.pdf_file
+            try:
+                # This is what saving the model would do for an uncommitted file.
+                rendered.save(
+                    # TYPING: the file has just been rendered, so it always has a name.
+                    rendered.name,  # type: ignore[arg-type]
+                    rendered.file,
+                    save=False,
+                )
+            finally:
+                # Release the rendered file's buffer.
+                rendered.close()
+            uploaded.append(pdf)
+
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                pending: set[Future[None]] = set()
+                # Rendering isn't thread-safe, so only uploading happens concurrently.
+                for pdf in queryset.select_related("receipt__validation").iterator():
+                    if len(pending) >= max_workers:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        # Raise any exceptions before rendering more files.
+                        for future in done:
+                            future.result()
+                    pdf.save_pdf(save_model=False, builder=builder)
+                    pending.add(executor.submit(upload, pdf))
+                for future in pending:
+                    future.result()
+        finally:
+            # Exiting the executor waits for pending uploads. Save those that
+            # succeeded, so that their files aren't orphaned.
+            self.bulk_update(uploaded, ["pdf_file"])
+
 
 class ReceiptPDF(models.Model):
     """Printable version of a receipt.
@@ -1635,6 +2200,25 @@ class ReceiptPDF(models.Model):
         verbose_name_plural = _("receipt pdfs")
 
 
+class ReceiptEntryQuerySet(models.QuerySet):
+    """The default queryset for :class:`~.ReceiptEntry`."""
+
+    def with_total_price(self) -> ReceiptEntryQuerySet:
+        """Annotate entries with their total price.
+
+        :attr:`~.ReceiptEntry.total_price` uses this value instead of computing it
+        again. The annotation may also be used to sort, filter or aggregate entries
+        by their total price in the database.
+        """
+        return self.annotate(
+            _total_price=ExpressionWrapper(
+                F("quantity") * F("unit_price") - F("discount"),
+                # Multiplying two amounts with two decimal places each yields four.
+                output_field=models.DecimalField(max_digits=31, decimal_places=4),
+            ),
+        )
+
+
 class ReceiptEntry(models.Model):
     """An entry in a receipt.
 
@@ -1683,9 +2267,17 @@ class ReceiptEntry(models.Model):
         on_delete=models.PROTECT,
     )
 
+    objects = ReceiptEntryQuerySet.as_manager()
+
     @property
     def total_price(self) -> Decimal:
-        """The total price for this entry is: ``quantity * price - discount``."""
+        """The total price for this entry is: ``quantity * price - discount``.
+
+        Uses the value annotated by :meth:`~.ReceiptEntryQuerySet.with_total_price`
+        if present.
+        """
+        if hasattr(self, "_total_price"):
+            return self._total_price
         return self.quantity * self.unit_price - self.discount
 
     class Meta:
@@ -1820,6 +2412,29 @@ class Observation(models.Model):
         verbose_name_plural = _("observations")
 
 
+class ReceiptValidationQuerySet(models.QuerySet):
+    """The default queryset for :class:`~.ReceiptValidation`."""
+
+    def with_receipt(self) -> ReceiptValidationQuerySet:
+        """Join validations with their receipts.
+
+        Use this when accessing the receipts of many validations, to avoid a query
+        for each of them. Receipts are joined with their type and point of sales,
+        which are needed to represent them (e.g.: via their formatted number).
+
+        If observations are needed too, chain with :meth:`with_observations`.
+        """
+        return self.select_related("receipt__receipt_type", "receipt__point_of_sales")
+
+    def with_observations(self) -> ReceiptValidationQuerySet:
+        """Prefetch the observations of validations.
+
+        Use this when accessing the observations of many validations, so that they
+        are all fetched with a single query, rather than one for each validation.
+        """
+        return self.prefetch_related("observations")
+
+
 class ReceiptValidation(models.Model):
     """The validation for a single :class:`~.Receipt`.
 
@@ -1832,15 +2447,17 @@ class ReceiptValidation(models.Model):
 
     RESULT_APPROVED = "A"
     RESULT_REJECTED = "R"
+    RESULT_CHOICES = (
+        (RESULT_APPROVED, _("approved")),
+        (RESULT_REJECTED, _("rejected")),
+    )
+    _RESULT_LABELS: ClassVar[dict[str, Promise]] = dict(RESULT_CHOICES)
 
     # TODO: replace this with a `successful` boolean field.
     result = models.CharField(
         _("result"),
         max_length=1,
-        choices=(
-            (RESULT_APPROVED, _("approved")),
-            (RESULT_REJECTED, _("rejected")),
-        ),
+        choices=RESULT_CHOICES,
         help_text=_("Indicates whether the validation was succesful or not."),
     )
     processed_date = models.DateTimeField(
@@ -1873,9 +2490,18 @@ class ReceiptValidation(models.Model):
         on_delete=models.PROTECT,
     )
 
+    objects = ReceiptValidationQuerySet.as_manager()
+
+    # TYPING: django-stubs already declares this method for fields with choices.
+    def get_result_display(self) -> str:  # type: ignore[no-redef]
+        # Overrides Django's implementation, which builds a dict of all choices on
+        # each call.
+        return str(self._RESULT_LABELS.get(self.result, self.result))
+
     def __str__(self) -> str:
-        return _("Validation for %s. Result: %s") % (
-            self.receipt,
+        # Avoid fetching the receipt, since this is usually rendered in lists.
+        return _("Validation for receipt #%s. Result: %s") % (
+            self.receipt_id,
             self.get_result_display(),
         )
 
@@ -1890,7 +2516,7 @@ class ReceiptValidation(models.Model):
         verbose_name_plural = _("receipt validations")
 
 
-class ClientVatConditionManager(models.Manager):
+class ClientVatConditionManager(models.Manager["ClientVatCondition"]):
     """Manager for ClientVatCondition.
 
     This class is only used to provide natural key support for the
@@ -1898,10 +2524,11 @@ class ClientVatConditionManager(models.Manager):
     """
 
     def get_by_natural_key(self, code: str) -> ClientVatCondition:
-        return self.get(code=code)
+        # The base manager is used so that no default filters or joins ever apply.
+        return self.model._base_manager.db_manager(self.db).get(code=code)
 
     def exists_by_natural_key(self, code: str) -> bool:
-        return self.filter(code=code).exists()
+        return self.model._base_manager.db_manager(self.db).filter(code=code).exists()
 
 
 class ClientVatCondition(models.Model):
@@ -1917,6 +2544,7 @@ class ClientVatCondition(models.Model):
     code = models.CharField(
         _("code"),
         max_length=3,
+        unique=True,
     )
     description = models.CharField(
         _("description"),
@@ -1959,13 +2587,43 @@ class ClientVatCondition(models.Model):
         )
         check_response(response)
 
+        # Diff against existing conditions, so that only new or changed ones are
+        # written. This needs a fixed amount of queries on any database backend.
+        existing = cls.objects.in_bulk(field_name="code")
+        to_create = []
+        to_update = []
         for condition_data in response.ResultGet.CondicionIvaReceptor:
-            condition, created = cls.objects.update_or_create(
-                code=condition_data.Id,
-                defaults={
-                    "description": condition_data.Desc,
-                    "cmp_clase": condition_data.Cmp_Clase,
-                },
+            # Read each field from the response once. Codes are numeric, but we
+            # always store them as strings.
+            code = str(condition_data.Id)
+            description = condition_data.Desc
+            cmp_clase = condition_data.Cmp_Clase
+
+            condition = existing.get(code)
+            if condition is None:
+                to_create.append(
+                    cls(code=code, description=description, cmp_clase=cmp_clase)
+                )
+            elif (condition.description, condition.cmp_clase) != (
+                description,
+                cmp_clase,
+            ):
+                condition.description = description
+                condition.cmp_clase = cmp_clase
+                to_update.append(condition)
+
+        if not to_create and not to_update:
+            return
+
+        # Both writes are committed together. Use the same database the writes
+        # are routed to, which may not be the default one. No savepoint is needed
+        # when already within a transaction (e.g.: load_metadata_transaction).
+        with transaction.atomic(using=router.db_for_write(cls), savepoint=False):
+            cls.objects.bulk_create(to_create, batch_size=_POPULATE_BATCH_SIZE)
+            cls.objects.bulk_update(
+                to_update,
+                ["description", "cmp_clase"],
+                batch_size=_POPULATE_BATCH_SIZE,
             )
 
     def natural_key(self) -> tuple[str]:
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from django.db.models.signals import post_delete
 from django.db.models.signals import post_save
 from django.db.models.signals import pre_save
 from django.dispatch import receiver
@@ -62,3 +63,9 @@ def delete_file_taxpayer(
         if old_file and old_file != new_file:
             # Delete the old file from storage.
             old_file.delete(save=False)
+
+
+@receiver(post_save, sender=models.CurrencyType)
+@receiver(post_delete, sender=models.CurrencyType)
+def clear_first_currency_cache(**kwargs) -> None:
+    models._first_currency_pk.cache_clear()
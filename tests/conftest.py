@@ -1,11 +1,13 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
 from unittest.mock import patch
 
 import pytest
 from django.conf import settings
 from django.core import serializers
+from django.db import connection
 
 from django_afip import models
 from django_afip.exceptions import AuthenticationError
@@ -30,6 +32,39 @@ def disable_durability_check() -> Generator[None, None, None]:
         yield
 
 
+@pytest.fixture(autouse=True)
+def clear_caches() -> Generator[None, None, None]:
+    """Clear any per-process caches, since the database is reset across tests."""
+    yield
+    models._first_currency_pk.cache_clear()
+
+
+@pytest.fixture
+def no_bulk_insert_returning() -> Generator[None, None, None]:
+    """Behave like backends that don't return rows from bulk inserts (e.g.: MySQL).
+
+    Primary keys are not set on bulk-created objects on these backends."""
+    with patch.object(
+        type(connection.features),
+        "can_return_rows_from_bulk_insert",
+        False,
+    ):
+        yield
+
+
+@pytest.fixture
+def wsfe_client() -> Generator[MagicMock, None, None]:
+    """Replace the WSFE client with a mock.
+
+    Ticket serialization is mocked too, so that no network access is required."""
+    client = MagicMock()
+    with (
+        patch("django_afip.models.clients.get_client", return_value=client),
+        patch("django_afip.models.serializers.serialize_ticket"),
+    ):
+        yield client
+
+
 def pytest_runtest_setup(item: pytest.Function) -> None:
     """Set live mode if the marker has been passed to pytest.
 
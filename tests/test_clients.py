@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
 from unittest.mock import patch
 
 import pytest
@@ -7,6 +8,12 @@ import requests
 from requests.exceptions import SSLError
 
 from django_afip.clients import get_client
+from django_afip.clients import get_or_create_transport
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from pytest_django.fixtures import SettingsWrapper
 
 
 @pytest.mark.live
@@ -18,6 +25,14 @@ def test_services_are_cached() -> None:
     assert service1 is service2
 
 
+def test_wsdl_cache_path(tmp_path: Path, settings: SettingsWrapper) -> None:
+    settings.AFIP_WSDL_CACHE = str(tmp_path / "wsdl.db")
+
+    transport = get_or_create_transport.__wrapped__()
+
+    assert transport.cache._db_path == str(tmp_path / "wsdl.db")
+
+
 def test_inexisting_service() -> None:
     with pytest.raises(ValueError, match="Unknown service name, nonexistant"):
         get_client("nonexistant", False)
@@ -1,16 +1,22 @@
 from __future__ import annotations
 
+import asyncio
 from datetime import date
 from datetime import datetime
 from datetime import timedelta
 from decimal import Decimal
+from types import SimpleNamespace
 from typing import TYPE_CHECKING
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
 import pytest
 from django import VERSION as DJANGO_VERSION
+from django.core import serializers
+from django.db import connection
 from django.db.models import DecimalField
+from django.db.models import ProtectedError
+from django.test.utils import CaptureQueriesContext
 from freezegun import freeze_time
 
 if DJANGO_VERSION[0] < 5:
@@ -22,6 +28,7 @@ from django_afip import exceptions
 from django_afip import factories
 from django_afip import models
 from django_afip.clients import TZ_AR
+from django_afip.factories import PointOfSalesFactory
 from django_afip.factories import ReceiptFactory
 from django_afip.factories import ReceiptFCEAWithVatAndTaxFactory
 from django_afip.factories import ReceiptFCEAWithVatTaxAndOptionalsFactory
@@ -29,8 +36,12 @@ from django_afip.factories import ReceiptValidationFactory
 from django_afip.factories import ReceiptWithApprovedValidation
 from django_afip.factories import ReceiptWithInconsistentVatAndTaxFactory
 from django_afip.factories import ReceiptWithVatAndTaxFactory
+from django_afip.factories import TaxFactory
+from django_afip.factories import VatFactory
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from django.db.models import QuerySet
 
     from django_afip.models import ReceiptQuerySet
@@ -61,6 +72,298 @@ def test_validate_validated() -> None:
 # TODO: Also another tests that checks that we only pass filtered-out receipts.
 
 
+@pytest.mark.django_db
+def test_assign_numbers() -> None:
+    today = date.today()
+    r1 = ReceiptFactory(issued_date=today)
+    r2 = ReceiptFactory(issued_date=today - timedelta(days=1))
+    r3 = ReceiptFactory(issued_date=today)
+    numbered = ReceiptFactory(receipt_number=3)
+
+    # TYPING: mypy can't understand default querysets.
+    qs: ReceiptQuerySet = models.Receipt.objects.order_by(  # type: ignore[assignment]
+        "issued_date", "id"
+    )
+    with (
+        patch("django_afip.models.TaxPayer.get_or_create_ticket", spec=True),
+        patch(
+            "django_afip.models.ReceiptManager.fetch_last_receipt_number",
+            spec=True,
+            return_value=5,
+        ),
+    ):
+        qs._assign_numbers()
+
+    for receipt in (r1, r2, r3, numbered):
+        receipt.refresh_from_db()
+
+    assert r2.receipt_number == 6
+    assert r1.receipt_number == 7
+    assert r3.receipt_number == 8
+    assert numbered.receipt_number == 3
+
+
+@pytest.mark.django_db
+def test_assign_numbers_queries(django_assert_num_queries: Callable) -> None:
+    ReceiptFactory()
+    ReceiptFactory()
+
+    def fake_fetch_last_receipt_number(
+        point_of_sales: models.PointOfSales,
+        receipt_type: models.ReceiptType,
+        ticket: models.AuthTicket | None = None,
+    ) -> int:
+        assert point_of_sales.owner.is_sandboxed
+        assert receipt_type.code == "6"
+        return 0
+
+    # TYPING: mypy can't understand default querysets.
+    qs: ReceiptQuerySet = models.Receipt.objects.all()  # type: ignore[assignment]
+    with (
+        patch(
+            "django_afip.models.Receipt.objects.fetch_last_receipt_number",
+            fake_fetch_last_receipt_number,
+        ),
+        django_assert_num_queries(2),
+    ):
+        qs._assign_numbers(ticket=MagicMock())
+
+
+@pytest.mark.django_db
+def test_assign_numbers_per_point_of_sales_and_type() -> None:
+    r1 = ReceiptFactory()
+    r2 = ReceiptFactory(point_of_sales=PointOfSalesFactory(number=2))
+    r3 = ReceiptFactory()
+    r4 = ReceiptFactory(receipt_type__code=11)
+
+    def fake_fetch_last_receipt_number(
+        point_of_sales: models.PointOfSales,
+        receipt_type: models.ReceiptType,
+        ticket: models.AuthTicket | None = None,
+    ) -> int:
+        return point_of_sales.number * 100 + int(receipt_type.code)
+
+    # TYPING: mypy can't understand default querysets.
+    qs: ReceiptQuerySet = models.Receipt.objects.order_by(  # type: ignore[assignment]
+        "id"
+    )
+    with (
+        patch("django_afip.models.TaxPayer.get_or_create_ticket", spec=True),
+        patch(
+            "django_afip.models.Receipt.objects.fetch_last_receipt_number",
+            fake_fetch_last_receipt_number,
+        ),
+    ):
+        qs._assign_numbers()
+
+    for receipt in (r1, r2, r3, r4):
+        receipt.refresh_from_db()
+
+    assert r1.receipt_number == 107
+    assert r2.receipt_number == 207
+    assert r3.receipt_number == 108
+    assert r4.receipt_number == 112
+
+
+def _cae_response(*details: SimpleNamespace) -> MagicMock:
+    """Return a fake response for FECAESolicitar with the given details."""
+    response = MagicMock(Errors=None, errorConstancia=None)
+    response.FeCabResp.FchProceso = "20250314153000"
+    response.FeDetResp.FECAEDetResponse = list(details)
+    return response
+
+
+@pytest.mark.django_db
+def test_validate_mixed_results(wsfe_client: MagicMock) -> None:
+    r1 = ReceiptFactory()
+    r2 = ReceiptFactory()
+    r3 = ReceiptFactory()
+
+    wsfe_client.service.FECAESolicitar.return_value = _cae_response(
+        SimpleNamespace(
+            Resultado="A",
+            CAE="67114072311850",
+            CAEFchVto="20250324",
+            CbteDesde=1,
+            Observaciones=None,
+        ),
+        SimpleNamespace(
+            Resultado="A",
+            CAE="67114072311851",
+            CAEFchVto="20250324",
+            CbteDesde=2,
+            Observaciones=SimpleNamespace(
+                Obs=[
+                    SimpleNamespace(Code=10217, Msg="Some observation"),
+                    SimpleNamespace(Code=10218, Msg="Another observation"),
+                ],
+            ),
+        ),
+        SimpleNamespace(
+            Resultado="R",
+            CAE="",
+            CAEFchVto="",
+            CbteDesde=3,
+            Observaciones=SimpleNamespace(
+                Obs=[SimpleNamespace(Code=10015, Msg="Some error")],
+            ),
+        ),
+    )
+
+    # TYPING: mypy can't understand default querysets.
+    qs: ReceiptQuerySet = models.Receipt.objects.all()  # type: ignore[assignment]
+    with (
+        patch(
+            "django_afip.models.ReceiptManager.fetch_last_receipt_number",
+            spec=True,
+            return_value=0,
+        ),
+        patch("django_afip.models.serializers.serialize_multiple_receipts"),
+    ):
+        errs = qs.validate(ticket=MagicMock())
+
+    assert errs == ["Error 10015: Some error"]
+
+    for receipt in (r1, r2, r3):
+        receipt.refresh_from_db()
+
+    assert r1.receipt_number == 1
+    assert r1.validation.cae == "67114072311850"
+    assert r1.validation.cae_expiration == date(2025, 3, 24)
+    assert r1.validation.processed_date == datetime(2025, 3, 14, 15, 30, tzinfo=TZ_AR)
+    assert r1.validation.observations.count() == 0
+    assert r2.receipt_number == 2
+    assert list(
+        r2.validation.observations.order_by("code").values_list("code", "message")
+    ) == [
+        (10217, "Some observation"),
+        (10218, "Another observation"),
+    ]
+    assert r3.receipt_number is None
+    assert not models.ReceiptValidation.objects.filter(receipt=r3).exists()
+
+
+@pytest.mark.django_db
+def test_validate_queries_do_not_grow_with_receipts(wsfe_client: MagicMock) -> None:
+    def validate(count: int, last_number: int) -> int:
+        wsfe_client.service.FECAESolicitar.return_value = _cae_response(
+            *(
+                SimpleNamespace(
+                    Resultado="A",
+                    CAE="67114072311850",
+                    CAEFchVto="20250324",
+                    CbteDesde=last_number + i,
+                    Observaciones=None,
+                )
+                for i in range(1, count + 1)
+            )
+        )
+        for _ in range(count):
+            receipt = ReceiptFactory()
+            VatFactory(receipt=receipt)
+            TaxFactory(receipt=receipt)
+
+        # TYPING: mypy can't understand default querysets.
+        qs: ReceiptQuerySet = models.Receipt.objects.all()  # type: ignore[assignment]
+        with (
+            patch(
+                "django_afip.models.ReceiptManager.fetch_last_receipt_number",
+                spec=True,
+                return_value=last_number,
+            ),
+            patch("django_afip.serializers.f", MagicMock()),
+            CaptureQueriesContext(connection) as queries,
+        ):
+            assert qs.validate(ticket=MagicMock()) == []
+
+        return len(queries)
+
+    assert validate(1, last_number=0) == validate(3, last_number=1)
+    assert models.ReceiptValidation.objects.count() == 4
+
+
+@pytest.mark.django_db
+def test_receipt_validation_with_receipt(django_assert_num_queries: Callable) -> None:
+    ReceiptValidationFactory(receipt__receipt_number=1)
+    ReceiptValidationFactory(receipt__receipt_number=2)
+
+    with django_assert_num_queries(1):
+        numbers = [
+            str(validation.receipt)
+            for validation in models.ReceiptValidation.objects.with_receipt()
+        ]
+
+    assert len(numbers) == 2
+
+
+@pytest.mark.django_db
+def test_receipt_validation_str(django_assert_num_queries: Callable) -> None:
+    validation = ReceiptValidationFactory()
+    validation = models.ReceiptValidation.objects.get(pk=validation.pk)
+
+    with django_assert_num_queries(0):
+        assert str(validation) == (
+            f"Validation for receipt #{validation.receipt_id}. Result: approved"
+        )
+
+
+@pytest.mark.django_db
+def test_receipt_validation_with_observations(
+    django_assert_num_queries: Callable,
+) -> None:
+    for i in range(1, 3):
+        validation = ReceiptValidationFactory(receipt__receipt_number=i)
+        validation.observations.add(
+            models.Observation.objects.create(code=i, message=f"Observation {i}")
+        )
+
+    with django_assert_num_queries(2):
+        messages = [
+            [observation.message for observation in validation.observations.all()]
+            for validation in models.ReceiptValidation.objects.with_observations()
+        ]
+
+    assert sorted(messages) == [["Observation 1"], ["Observation 2"]]
+
+
+@pytest.mark.django_db
+def test_receipt_validation_repr(django_assert_num_queries: Callable) -> None:
+    validation = ReceiptValidationFactory()
+    validation = models.ReceiptValidation.objects.get(pk=validation.pk)
+
+    with django_assert_num_queries(0):
+        assert repr(validation) == (
+            f"<ReceiptValidation {validation.pk}: A "
+            f"for Receipt {validation.receipt_id}>"
+        )
+
+
+def test_receipt_validation_get_result_display() -> None:
+    validation = models.ReceiptValidation(
+        result=models.ReceiptValidation.RESULT_REJECTED
+    )
+    assert validation.get_result_display() == "rejected"
+
+    validation.result = "X"
+    assert validation.get_result_display() == "X"
+
+
+@pytest.mark.django_db
+def test_formatted_number() -> None:
+    receipt = ReceiptFactory(
+        point_of_sales=PointOfSalesFactory(number=2),
+        receipt_number=3087,
+    )
+
+    assert receipt.point_of_sales.formatted_prefix == "0002"
+    assert receipt.formatted_number == "0002-00003087"
+
+
+@pytest.mark.django_db
+def test_formatted_number_without_number() -> None:
+    assert ReceiptFactory().formatted_number is None
+
+
 def test_default_receipt_manager() -> None:
     assert isinstance(models.Receipt.objects, models.ReceiptManager)
 
@@ -71,12 +374,13 @@ def test_validate_receipt() -> None:
     ticket = MagicMock()
     ticket._called = False
 
-    def fake_validate(qs: QuerySet, ticket: MagicMock) -> None:
+    def fake_validate(qs: QuerySet, ticket: MagicMock) -> tuple[list, dict]:
         assertQuerySetEqual(qs, [receipt.pk], lambda r: r.pk)
         ticket._called = True
+        return [], {}
 
     with patch(
-        "django_afip.models.ReceiptQuerySet.validate",
+        "django_afip.models.ReceiptQuerySet._validate",
         fake_validate,
     ):
         receipt.validate(ticket)
@@ -84,6 +388,99 @@ def test_validate_receipt() -> None:
     assert ticket._called is True
 
 
+@pytest.mark.django_db(transaction=True)
+def test_avalidate(wsfe_client: MagicMock) -> None:
+    receipt = ReceiptFactory()
+    wsfe_client.service.FECAESolicitar.return_value = _cae_response(
+        SimpleNamespace(
+            Resultado="A",
+            CAE="67114072311850",
+            CAEFchVto="20250324",
+            CbteDesde=1,
+            Observaciones=None,
+        ),
+    )
+
+    # TYPING: mypy can't understand default querysets.
+    qs: ReceiptQuerySet = models.Receipt.objects.all()  # type: ignore[assignment]
+    with (
+        patch(
+            "django_afip.models.ReceiptManager.fetch_last_receipt_number",
+            spec=True,
+            return_value=0,
+        ),
+        patch("django_afip.models.serializers.serialize_multiple_receipts"),
+    ):
+        assert asyncio.run(qs.avalidate(ticket=MagicMock())) == []
+
+    receipt.refresh_from_db()
+    assert receipt.receipt_number == 1
+    assert receipt.validation.cae == "67114072311850"
+
+
+@pytest.mark.django_db
+def test_validate_receipt_updates_instance(
+    wsfe_client: MagicMock,
+    django_assert_num_queries: Callable,
+) -> None:
+    receipt = ReceiptFactory()
+    wsfe_client.service.FECAESolicitar.return_value = _cae_response(
+        SimpleNamespace(
+            Resultado="A",
+            CAE="67114072311850",
+            CAEFchVto="20250324",
+            CbteDesde=8,
+            Observaciones=None,
+        ),
+    )
+
+    with (
+        patch(
+            "django_afip.models.ReceiptManager.fetch_last_receipt_number",
+            spec=True,
+            return_value=7,
+        ),
+        patch("django_afip.models.serializers.serialize_multiple_receipts"),
+    ):
+        assert receipt.validate(MagicMock()) == []
+
+    with django_assert_num_queries(0):
+        assert receipt.receipt_number == 8
+        assert receipt.is_validated
+        assert receipt.validation.cae == "67114072311850"
+
+
+@pytest.mark.django_db
+def test_validate_receipt_without_bulk_insert_returning(
+    wsfe_client: MagicMock,
+    no_bulk_insert_returning: None,
+) -> None:
+    receipt = ReceiptFactory()
+    wsfe_client.service.FECAESolicitar.return_value = _cae_response(
+        SimpleNamespace(
+            Resultado="A",
+            CAE="67114072311850",
+            CAEFchVto="20250324",
+            CbteDesde=8,
+            Observaciones=None,
+        ),
+    )
+
+    with (
+        patch(
+            "django_afip.models.ReceiptManager.fetch_last_receipt_number",
+            spec=True,
+            return_value=7,
+        ),
+        patch("django_afip.models.serializers.serialize_multiple_receipts"),
+    ):
+        assert receipt.validate(MagicMock()) == []
+
+    assert receipt.validation.pk is not None
+    assert receipt.validation == models.ReceiptValidation.objects.get(receipt=receipt)
+    assert not receipt.validation.observations.exists()
+
+
 @pytest.mark.django_db
 @pytest.mark.live
 def test_validate_invoice(populated_db: None) -> None:
@@ -285,6 +682,201 @@ def test_receipt_revalidate_without_receipt_number() -> None:
     assert validation is None
 
 
+@pytest.mark.django_db
+def test_receipt_revalidate_already_validated(
+    django_assert_num_queries: Callable,
+) -> None:
+    ReceiptWithApprovedValidation()
+    ReceiptWithApprovedValidation()
+
+    receipts = list(models.Receipt.objects.with_validation())
+    with django_assert_num_queries(0):
+        for receipt in receipts:
+            assert receipt.revalidate() == receipt.validation
+
+
+@pytest.mark.django_db
+def test_receipt_revalidate_with_observations() -> None:
+    receipt = ReceiptFactory(receipt_number=1)
+    receipt_data = SimpleNamespace(
+        Resultado="A",
+        CodAutorizacion="67114072311850",
+        FchVto="20250324",
+        FchProceso="20250314153000",
+        Observaciones=SimpleNamespace(
+            Obs=[
+                SimpleNamespace(Code=10217, Msg="Some observation"),
+                SimpleNamespace(Code=10218, Msg="Another observation"),
+            ],
+        ),
+    )
+
+    with patch(
+        "django_afip.models.ReceiptManager.fetch_receipt_data",
+        spec=True,
+        return_value=receipt_data,
+    ):
+        validation = receipt.revalidate()
+
+    assert validation is not None
+    assert validation.cae == "67114072311850"
+    assert sorted(validation.observations.values_list("code", flat=True)) == [
+        10217,
+        10218,
+    ]
+
+
+@pytest.mark.django_db
+def test_receipt_queryset_revalidate() -> None:
+    approved = ReceiptFactory(receipt_number=1)
+    unknown = ReceiptFactory(receipt_number=2)
+    rejected = ReceiptFactory(receipt_number=3)
+    ReceiptFactory(receipt_number=None)
+    ReceiptWithApprovedValidation(receipt_number=4)
+
+    def fetch_receipt_data(
+        receipt_type: str,
+        receipt_number: int,
+        point_of_sales: models.PointOfSales,
+        ticket: models.AuthTicket | None = None,
+    ) -> SimpleNamespace | None:
+        if receipt_number == 1:
+            return SimpleNamespace(
+                Resultado="A",
+                CodAutorizacion="67114072311850",
+                FchVto="20250324",
+                FchProceso="20250314153000",
+                Observaciones=SimpleNamespace(
+                    Obs=[SimpleNamespace(Code=10217, Msg="Some observation")],
+                ),
+            )
+        if receipt_number == 3:
+            return SimpleNamespace(Resultado="R")
+        assert receipt_number == 2
+        return None
+
+    with (
+        patch("django_afip.models.TaxPayer.get_or_create_ticket", spec=True),
+        patch(
+            "django_afip.models.Receipt.objects.fetch_receipt_data",
+            fetch_receipt_data,
+        ),
+    ):
+        # TYPING: django-stubs can't handle methods in querysets
+        validations = models.Receipt.objects.all().revalidate()  # type: ignore[attr-defined]
+
+    assert [v.receipt for v in validations] == [approved]
+    approved.refresh_from_db()
+    assert approved.validation.cae == "67114072311850"
+    assert list(approved.validation.observations.values_list("code", flat=True)) == [
+        10217,
+    ]
+    assert not models.ReceiptValidation.objects.filter(
+        receipt__in=[unknown, rejected],
+    ).exists()
+    assert models.ReceiptValidation.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_receipt_queryset_revalidate_reuses_observations() -> None:
+    existing = models.Observation.objects.create(code=10217, message="Some observation")
+    first = ReceiptFactory(receipt_number=1)
+    second = ReceiptFactory(receipt_number=2)
+    receipt_data = SimpleNamespace(
+        Resultado="A",
+        CodAutorizacion="67114072311850",
+        FchVto="20250324",
+        FchProceso="20250314153000",
+        Observaciones=SimpleNamespace(
+            Obs=[
+                SimpleNamespace(Code=10217, Msg="Some observation"),
+                SimpleNamespace(Code=10217, Msg="Another observation"),
+            ],
+        ),
+    )
+
+    with (
+        patch("django_afip.models.TaxPayer.get_or_create_ticket", spec=True),
+        patch(
+            "django_afip.models.Receipt.objects.fetch_receipt_data",
+            return_value=receipt_data,
+        ),
+    ):
+        # TYPING: django-stubs can't handle methods in querysets
+        models.Receipt.objects.all().revalidate()  # type: ignore[attr-defined]
+
+    assert models.Observation.objects.count() == 2
+    new = models.Observation.objects.get(message="Another observation")
+    for receipt in (first, second):
+        receipt.refresh_from_db()
+        assertQuerySetEqual(
+            receipt.validation.observations.order_by("id"),
+            [existing, new],
+        )
+
+
+@pytest.mark.django_db
+def test_receipt_queryset_revalidate_fetches_one_ticket_per_owner() -> None:
+    first = ReceiptFactory(receipt_number=1)
+    ReceiptFactory(receipt_number=2, point_of_sales=first.point_of_sales)
+    other = ReceiptFactory(receipt_number=3, point_of_sales__owner__cuit=20111111112)
+    tickets = {
+        first.point_of_sales.owner: MagicMock(),
+        other.point_of_sales.owner: MagicMock(),
+    }
+
+    with (
+        patch(
+            "django_afip.models.TaxPayer.get_or_create_ticket",
+            autospec=True,
+            side_effect=lambda owner, service: tickets[owner],
+        ) as get_or_create_ticket,
+        patch(
+            "django_afip.models.Receipt.objects.fetch_receipt_data",
+            return_value=None,
+        ) as fetch_receipt_data,
+    ):
+        # TYPING: django-stubs can't handle methods in querysets
+        models.Receipt.objects.all().revalidate()  # type: ignore[attr-defined]
+
+    assert get_or_create_ticket.call_count == 2
+    assert sorted(
+        (call.args[1], call.kwargs["ticket"])
+        for call in fetch_receipt_data.call_args_list
+    ) == [
+        (1, tickets[first.point_of_sales.owner]),
+        (2, tickets[first.point_of_sales.owner]),
+        (3, tickets[other.point_of_sales.owner]),
+    ]
+
+
+@pytest.mark.django_db
+def test_receipt_queryset_revalidate_without_bulk_insert_returning(
+    no_bulk_insert_returning: None,
+) -> None:
+    receipt = ReceiptFactory(receipt_number=1)
+    receipt_data = SimpleNamespace(
+        Resultado="A",
+        CodAutorizacion="67114072311850",
+        FchVto="20250324",
+        FchProceso="20250314153000",
+        Observaciones=None,
+    )
+
+    with (
+        patch("django_afip.models.TaxPayer.get_or_create_ticket", spec=True),
+        patch(
+            "django_afip.models.Receipt.objects.fetch_receipt_data",
+            return_value=receipt_data,
+        ),
+    ):
+        # TYPING: django-stubs can't handle methods in querysets
+        [validation] = models.Receipt.objects.all().revalidate()  # type: ignore[attr-defined]
+
+    assert validation.pk is not None
+    assert validation == models.ReceiptValidation.objects.get(receipt=receipt)
+
+
 @pytest.mark.django_db
 def test_receipt_is_validated_when_not_validated() -> None:
     receipt = ReceiptFactory()
@@ -297,6 +889,17 @@ def test_receipt_is_validated_when_validated() -> None:
     assert receipt.is_validated
 
 
+@pytest.mark.django_db
+def test_receipt_with_validation_cannot_be_deleted() -> None:
+    """Validations are the fiscal record of a receipt, and must never be lost."""
+    receipt = ReceiptWithApprovedValidation()
+
+    with pytest.raises(ProtectedError):
+        receipt.delete()
+
+    assert models.ReceiptValidation.objects.filter(receipt=receipt).exists()
+
+
 @pytest.mark.django_db
 def test_receipt_is_validated_when_failed_validation() -> None:
     # These should never really exist,but oh well:
@@ -396,6 +999,24 @@ def test_total_tax_proper_filtering() -> None:
     assert receipt.total_tax == 9
 
 
+@pytest.mark.django_db
+def test_with_totals(django_assert_num_queries: Callable) -> None:
+    receipt = ReceiptFactory()
+    factories.VatFactory(receipt=receipt)
+    factories.VatFactory(receipt=receipt)
+    factories.TaxFactory(receipt=receipt)
+    factories.TaxFactory()
+    empty = ReceiptFactory()
+
+    # TYPING: django-stubs can't handle methods in querysets
+    qs = models.Receipt.objects.filter(pk__in=[receipt.pk, empty.pk]).with_totals()  # type: ignore[attr-defined]
+    with django_assert_num_queries(1):
+        receipts = list(qs.order_by("pk"))
+        assert [(r.total_vat, r.total_tax) for r in receipts] == [(42, 9), (0, 0)]
+
+    assert receipts == [receipt, empty]
+
+
 def test_currenty_type_success() -> None:
     currency_type = models.CurrencyType(code="011", description="Pesos Uruguayos")
     assert str(currency_type) == "Pesos Uruguayos (011)"
@@ -409,6 +1030,84 @@ def test_populate_method(live_ticket: models.AuthTicket) -> None:
     assert models.CurrencyType.objects.count() == 49
 
 
+@pytest.mark.django_db
+def test_populate_method_skips_existing(wsfe_client: MagicMock) -> None:
+    factories.ReceiptTypeFactory(code="11", description="Factura C")
+    response = MagicMock(Errors=None, errorConstancia=None)
+    response.ResultGet.CbteTipo = [
+        SimpleNamespace(Id=6, Desc="Factura B", FchDesde="20100917", FchHasta="NULL"),
+        SimpleNamespace(Id=11, Desc="Factura C", FchDesde="20110330", FchHasta="NULL"),
+    ]
+    wsfe_client.service.FEParamGetTiposCbte.return_value = response
+
+    models.ReceiptType.objects.populate(ticket=MagicMock())
+    models.ReceiptType.objects.populate(ticket=MagicMock())
+
+    assertQuerySetEqual(
+        models.ReceiptType.objects.order_by("code"),
+        [("11", "Factura C"), ("6", "Factura B")],
+        lambda rt: (rt.code, rt.description),
+    )
+    assert models.ReceiptType.objects.get(code="6").valid_from == date(2010, 9, 17)
+
+
+@pytest.mark.django_db
+def test_populate_method_unchanged(
+    wsfe_client: MagicMock,
+    django_assert_num_queries: Callable,
+) -> None:
+    factories.ReceiptTypeFactory(code="11", description="Factura C")
+    response = MagicMock(Errors=None, errorConstancia=None)
+    response.ResultGet.CbteTipo = [
+        SimpleNamespace(Id=11, Desc="Factura C", FchDesde="20110330", FchHasta="NULL"),
+    ]
+    wsfe_client.service.FEParamGetTiposCbte.return_value = response
+
+    # Only existing types are fetched; nothing is written:
+    with django_assert_num_queries(1):
+        models.ReceiptType.objects.populate(ticket=MagicMock())
+
+
+@pytest.mark.django_db
+def test_load_metadata_transaction_rolls_back(wsfe_client: MagicMock) -> None:
+    response = MagicMock(Errors=None, errorConstancia=None)
+    response.ResultGet.CbteTipo = [
+        SimpleNamespace(Id=6, Desc="Factura B", FchDesde="20100917", FchHasta="NULL"),
+    ]
+    wsfe_client.service.FEParamGetTiposCbte.return_value = response
+    wsfe_client.service.FEParamGetCondicionIvaReceptor.return_value = MagicMock(
+        Errors=SimpleNamespace(
+            Err=[SimpleNamespace(Code=600, Msg="ValidacionDeToken")]
+        ),
+    )
+
+    def refresh() -> None:
+        with models.load_metadata_transaction():
+            models.ReceiptType.objects.populate(ticket=MagicMock())
+            models.ClientVatCondition.populate(ticket=MagicMock())
+
+    with pytest.raises(exceptions.AfipException):
+        refresh()
+
+    assert not models.ReceiptType.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_load_metadata_transaction_no_savepoints(wsfe_client: MagicMock) -> None:
+    wsfe_client.service.FEParamGetCondicionIvaReceptor.return_value = (
+        _client_vat_conditions_response(("1", "IVA Responsable Inscripto", "A,M,C"))
+    )
+
+    with (
+        CaptureQueriesContext(connection) as context,
+        models.load_metadata_transaction(),
+    ):
+        models.ClientVatCondition.populate(ticket=MagicMock())
+
+    assert not any("SAVEPOINT" in query["sql"] for query in context.captured_queries)
+    assert models.ClientVatCondition.objects.count() == 1
+
+
 @pytest.mark.django_db
 def test_receipt_entry_without_discount() -> None:
     """
@@ -440,6 +1139,22 @@ def test_receipt_entry_with_valid_discount() -> None:
     assert receipt_entry.total_price == 40
 
 
+@pytest.mark.django_db
+def test_receipt_entry_with_total_price(django_assert_num_queries: Callable) -> None:
+    entry = factories.ReceiptEntryFactory(
+        quantity=Decimal("1.5"),
+        unit_price=Decimal("2.33"),
+        discount=Decimal("0.1"),
+    )
+    factories.ReceiptEntryFactory(receipt=entry.receipt, quantity=1, unit_price=50)
+
+    with django_assert_num_queries(1):
+        entries = list(
+            entry.receipt.entries.with_total_price().order_by("-_total_price")
+        )
+        assert [e.total_price for e in entries] == [Decimal(50), Decimal("3.395")]
+
+
 @pytest.mark.django_db
 def test_receipt_entry_negative_discount() -> None:
     """
@@ -606,6 +1321,51 @@ def test_approximate_date_failure() -> None:
         receipt.approximate_date()
 
 
+@pytest.mark.django_db
+@freeze_time("2023-11-16 18:39:40")
+def test_approximate_dates(django_assert_num_queries: Callable) -> None:
+    today = datetime.now(TZ_AR).date()
+
+    factories.ReceiptWithApprovedValidation(issued_date=today - timedelta(days=1))
+    old = factories.ReceiptFactory(issued_date=today - timedelta(days=30))
+    older = factories.ReceiptFactory(issued_date=today - timedelta(days=40))
+    recent = factories.ReceiptFactory(issued_date=today - timedelta(days=2))
+    numbered = factories.ReceiptFactory(
+        issued_date=today - timedelta(days=30),
+        receipt_number=3,
+    )
+
+    # TYPING: django-stubs can't handle methods in querysets
+    qs = models.Receipt.objects.all()
+    with django_assert_num_queries(3):
+        changed = qs.approximate_dates()  # type: ignore[attr-defined]
+
+    assert changed == 3
+    for receipt in (old, older, recent, numbered):
+        receipt.refresh_from_db()
+    assert old.issued_date == date(2023, 11, 15)
+    assert older.issued_date == date(2023, 11, 15)
+    assert recent.issued_date == date(2023, 11, 15)
+    assert numbered.issued_date == date(2023, 10, 17)
+
+
+@pytest.mark.django_db
+@freeze_time("2023-11-16 18:39:40")
+def test_approximate_dates_without_most_recent() -> None:
+    today = datetime.now(TZ_AR).date()
+    receipt = factories.ReceiptFactory(issued_date=today - timedelta(days=30))
+    recent = factories.ReceiptFactory(issued_date=today - timedelta(days=2))
+
+    # TYPING: django-stubs can't handle methods in querysets
+    changed = models.Receipt.objects.all().approximate_dates()  # type: ignore[attr-defined]
+
+    assert changed == 1
+    receipt.refresh_from_db()
+    assert receipt.issued_date == date(2023, 11, 11)
+    recent.refresh_from_db()
+    assert recent.issued_date == date(2023, 11, 14)
+
+
 @pytest.mark.django_db
 def test_client_vat_condition_fields() -> None:
     """Test that ClientVatCondition fields are properly set."""
@@ -645,6 +1405,74 @@ def test_client_vat_condition_populate(live_ticket: models.AuthTicket) -> None:
     assert models.ClientVatCondition.objects.count() == initial_count
 
 
+def _client_vat_conditions_response(
+    *conditions: tuple[str | int, str, str],
+) -> SimpleNamespace:
+    """Return a fake response for FEParamGetCondicionIvaReceptor."""
+    return SimpleNamespace(
+        ResultGet=SimpleNamespace(
+            CondicionIvaReceptor=[
+                SimpleNamespace(Id=code, Desc=desc, Cmp_Clase=cmp_clase)
+                for code, desc, cmp_clase in conditions
+            ],
+        ),
+    )
+
+
+@pytest.mark.django_db
+def test_client_vat_condition_populate_diffs(
+    wsfe_client: MagicMock,
+    django_assert_max_num_queries: Callable,
+) -> None:
+    models.ClientVatCondition.objects.create(
+        code="1", description="Old description", cmp_clase="A"
+    )
+    wsfe_client.service.FEParamGetCondicionIvaReceptor.return_value = (
+        _client_vat_conditions_response(
+            ("1", "IVA Responsable Inscripto", "A,M,C"),
+            ("4", "IVA Sujeto Exento", "B,C"),
+            ("5", "Consumidor Final", "B,C,49"),
+        )
+    )
+
+    # One query to fetch existing conditions, one to insert new ones and one to
+    # update changed ones:
+    with django_assert_max_num_queries(3):
+        models.ClientVatCondition.populate(ticket=MagicMock())
+
+    assert list(
+        models.ClientVatCondition.objects.order_by("code").values_list(
+            "code", "description", "cmp_clase"
+        )
+    ) == [
+        ("1", "IVA Responsable Inscripto", "A,M,C"),
+        ("4", "IVA Sujeto Exento", "B,C"),
+        ("5", "Consumidor Final", "B,C,49"),
+    ]
+
+
+@pytest.mark.django_db
+def test_client_vat_condition_populate_numeric_codes(wsfe_client: MagicMock) -> None:
+    """AFIP returns numeric codes, which must match the existing string ones."""
+    models.ClientVatCondition.objects.create(
+        code="1", description="IVA Responsable Inscripto", cmp_clase="A,M,C"
+    )
+    wsfe_client.service.FEParamGetCondicionIvaReceptor.return_value = (
+        _client_vat_conditions_response(
+            (1, "IVA Responsable Inscripto", "A,M,C"),
+            (4, "IVA Sujeto Exento", "B,C"),
+        )
+    )
+
+    models.ClientVatCondition.populate(ticket=MagicMock())
+
+    assert list(
+        models.ClientVatCondition.objects.order_by("code").values_list(
+            "code", flat=True
+        )
+    ) == ["1", "4"]
+
+
 @pytest.mark.django_db
 def test_load_metadata() -> None:
     """Test populating AFIP models from fixtures."""
@@ -674,3 +1502,148 @@ def test_load_metadata() -> None:
     models.load_metadata()
     for i, m in enumerate(fetched_models):
         assert m.objects.count() == counts[i]
+
+
+@pytest.mark.parametrize(
+    "response",
+    [
+        SimpleNamespace(Errors=None),
+        SimpleNamespace(errorConstancia=None),
+        SimpleNamespace(ResultGet=[]),
+    ],
+)
+def test_check_response_ok(response: SimpleNamespace) -> None:
+    models.check_response(response)
+
+
+def test_check_response_errors() -> None:
+    response = SimpleNamespace(
+        Errors=SimpleNamespace(Err=[SimpleNamespace(Code=600, Msg="Token invalido")]),
+        errorConstancia=None,
+    )
+
+    with pytest.raises(exceptions.AfipException, match="Error 600: Token invalido"):
+        models.check_response(response)
+
+
+def test_check_response_error_constancia() -> None:
+    response = SimpleNamespace(
+        Errors=None,
+        errorConstancia=SimpleNamespace(
+            idPersona=20329642330,
+            error=["No existe persona con ese Id"],
+        ),
+    )
+
+    with pytest.raises(
+        exceptions.AfipException,
+        match="Error 20329642330: No existe persona con ese Id",
+    ):
+        models.check_response(response)
+
+
+@pytest.mark.django_db
+def test_check_groupable() -> None:
+    ReceiptFactory()
+    ReceiptFactory()
+
+    qs = models.Receipt.objects.all()
+    assert qs.check_groupable() is qs  # type: ignore[attr-defined]
+
+
+@pytest.mark.django_db
+def test_check_groupable_different_types() -> None:
+    ReceiptFactory(receipt_type__code=6)
+    ReceiptFactory(receipt_type__code=11)
+
+    with pytest.raises(exceptions.CannotValidateTogether):
+        models.Receipt.objects.all().check_groupable()  # type: ignore[attr-defined]
+
+
+@pytest.mark.django_db
+def test_first_currency_is_cached(django_assert_num_queries: Callable) -> None:
+    currency = factories.CurrencyTypeFactory(code="PES")
+
+    with django_assert_num_queries(1):
+        assert models.first_currency() == currency.pk
+        assert models.first_currency() == currency.pk
+
+    currency.delete()
+    assert models.first_currency() is None
+
+
+@pytest.mark.django_db
+def test_client_vat_condition_populate_unchanged(
+    wsfe_client: MagicMock,
+    django_assert_num_queries: Callable,
+) -> None:
+    models.ClientVatCondition.objects.create(
+        code="1", description="IVA Responsable Inscripto", cmp_clase="A,M,C"
+    )
+    wsfe_client.service.FEParamGetCondicionIvaReceptor.return_value = (
+        _client_vat_conditions_response(("1", "IVA Responsable Inscripto", "A,M,C"))
+    )
+
+    # Only existing conditions are fetched; nothing is written:
+    with django_assert_num_queries(1):
+        models.ClientVatCondition.populate(ticket=MagicMock())
+
+
+@pytest.mark.django_db
+def test_client_vat_condition_natural_key_lookups(
+    django_assert_num_queries: Callable,
+) -> None:
+    manager = models.ClientVatCondition.objects
+    assert not manager.exists_by_natural_key("5")
+
+    condition = manager.create(code="5", description="Consumidor Final", cmp_clase="B")
+
+    with django_assert_num_queries(1):
+        assert manager.exists_by_natural_key("5")
+
+    with django_assert_num_queries(1):
+        assert manager.get_by_natural_key("5") == condition
+
+    condition.delete()
+    assert not manager.exists_by_natural_key("5")
+
+
+@pytest.mark.django_db
+def test_client_vat_condition_populate_in_batches(wsfe_client: MagicMock) -> None:
+    wsfe_client.service.FEParamGetCondicionIvaReceptor.return_value = (
+        _client_vat_conditions_response(
+            ("1", "IVA Responsable Inscripto", "A,M,C"),
+            ("4", "IVA Sujeto Exento", "B,C"),
+            ("5", "Consumidor Final", "B,C,49"),
+        )
+    )
+
+    with (
+        patch("django_afip.models._POPULATE_BATCH_SIZE", 2),
+        CaptureQueriesContext(connection) as queries,
+    ):
+        models.ClientVatCondition.populate(ticket=MagicMock())
+
+    inserts = [q for q in queries if q["sql"].startswith("INSERT")]
+    assert len(inserts) == 2
+    assert models.ClientVatCondition.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_client_vat_condition_natural_key_round_trip() -> None:
+    condition = models.ClientVatCondition.objects.create(
+        code="5", description="Consumidor Final", cmp_clase="B,C,49"
+    )
+    receipt = ReceiptFactory(client_vat_condition=condition)
+
+    data = serializers.serialize(
+        "json",
+        [condition, receipt],
+        use_natural_foreign_keys=True,
+        use_natural_primary_keys=True,
+    )
+    assert '"client_vat_condition": ["5"]' in data
+
+    objects = list(serializers.deserialize("json", data))
+    assert objects[0].object.pk == condition.pk
+    assert objects[1].object.client_vat_condition_id == condition.pk
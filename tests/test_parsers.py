@@ -3,6 +3,8 @@ from __future__ import annotations
 from datetime import date
 from datetime import datetime
 
+import pytest
+
 from django_afip import parsers
 from django_afip.clients import TZ_AR
 
@@ -38,6 +40,18 @@ def test_parse_dates() -> None:
     assert parsers.parse_date_maybe("20170730") == date(2017, 7, 30)
 
 
+@pytest.mark.parametrize("datestring", ["2017073", "2017-07-30", "20171330"])
+def test_parse_invalid_dates(datestring: str) -> None:
+    with pytest.raises(ValueError, match=r"Invalid date|must be in"):
+        parsers.parse_date(datestring)
+
+
+@pytest.mark.parametrize("datestring", ["20170730", "20170730 54330", "20170730256000"])
+def test_parse_invalid_datetimes(datestring: str) -> None:
+    with pytest.raises(ValueError, match=r"Invalid datetime|must be in"):
+        parsers.parse_datetime(datestring)
+
+
 def test_weirdly_encoded() -> None:
     # This is the encoding AFIP sometimes uses:
     string = "AÃ±adir paÃ\xads"
@@ -3,9 +3,11 @@ from __future__ import annotations
 import random
 import re
 from datetime import date
+from typing import TYPE_CHECKING
 from unittest.mock import patch
 
 import pytest
+from django.core.files.storage import FileSystemStorage
 from django.core.paginator import Paginator
 
 from django_afip import factories
@@ -14,6 +16,9 @@ from django_afip.pdf import PdfBuilder
 from django_afip.pdf import ReceiptQrCode
 from django_afip.pdf import create_entries_context_for_render
 
+if TYPE_CHECKING:
+    from django.core.files import File
+
 
 @pytest.mark.django_db
 def test_pdf_generation() -> None:
@@ -148,3 +153,101 @@ def test_receipt_pdf_call_function() -> None:
 
     assert mocked_call.called
     assert mocked_call.call_count == 1
+
+
+@pytest.mark.django_db
+def test_save_pdfs_shares_builder() -> None:
+    pdfs = [factories.ReceiptPDFFactory(receipt__receipt_number=i) for i in range(1, 4)]
+    for pdf in pdfs:
+        factories.ReceiptValidationFactory(receipt=pdf.receipt)
+    builder = PdfBuilder()
+
+    with patch.object(builder, "render_pdf", wraps=builder.render_pdf) as render:
+        models.ReceiptPDF.objects.save_pdfs(builder=builder)
+
+    assert render.call_count == 3
+    for pdf in pdfs:
+        pdf.refresh_from_db()
+        assert pdf.pdf_file.name.endswith(".pdf")
+
+
+@pytest.mark.django_db
+def test_save_pdfs_uploads_files() -> None:
+    pdfs = [factories.ReceiptPDFFactory(receipt__receipt_number=i) for i in range(1, 4)]
+    for pdf in pdfs:
+        factories.ReceiptValidationFactory(receipt=pdf.receipt)
+    regex = r"afip/receipts/[a-f0-9]{2}/[a-f0-9]{2}/[a-f0-9]{32}.pdf"
+
+    models.ReceiptPDF.objects.save_pdfs(max_workers=2)
+
+    names = set()
+    for pdf in pdfs:
+        pdf.refresh_from_db()
+        assert re.match(regex, pdf.pdf_file.name)
+        assert pdf.pdf_file.storage.exists(pdf.pdf_file.name)
+        names.add(pdf.pdf_file.name)
+    assert len(names) == 3
+
+
+@pytest.mark.django_db
+def test_save_pdfs_limits_rendered_files_in_memory() -> None:
+    for i in range(1, 6):
+        pdf = factories.ReceiptPDFFactory(receipt__receipt_number=i)
+        factories.ReceiptValidationFactory(receipt=pdf.receipt)
+    builder = PdfBuilder()
+    render_pdf = builder.render_pdf
+    rendered: list[File] = []
+
+    def render(receipt: models.Receipt, pdf_file: File) -> None:
+        # Files which have already been uploaded are closed.
+        assert sum(not f.closed for f in rendered) <= 2
+        rendered.append(pdf_file)
+        render_pdf(receipt, pdf_file)
+
+    with patch.object(builder, "render_pdf", render):
+        models.ReceiptPDF.objects.save_pdfs(builder=builder, max_workers=2)
+
+    assert len(rendered) == 5
+    assert all(f.closed for f in rendered)
+
+
+@pytest.mark.django_db
+def test_save_pdfs_upload_failure_keeps_uploaded_files() -> None:
+    pdfs = [factories.ReceiptPDFFactory(receipt__receipt_number=i) for i in range(1, 4)]
+    for pdf in pdfs:
+        factories.ReceiptValidationFactory(receipt=pdf.receipt)
+    storage_save = FileSystemStorage.save
+    saved: list[str] = []
+
+    def save(storage: FileSystemStorage, name: str, *args, **kwargs) -> str:
+        if saved:
+            raise OSError("Storage is unavailable")
+        saved.append(storage_save(storage, name, *args, **kwargs))
+        return saved[-1]
+
+    with (
+        patch.object(FileSystemStorage, "save", save),
+        pytest.raises(OSError, match="Storage is unavailable"),
+    ):
+        models.ReceiptPDF.objects.save_pdfs(
+            models.ReceiptPDF.objects.order_by("id"),
+            max_workers=1,
+        )
+
+    assert [pdf.pdf_file.name for pdf in models.ReceiptPDF.objects.order_by("id")] == [
+        saved[0],
+        "",
+        "",
+    ]
+
+
+@pytest.mark.django_db
+def test_save_pdfs_unauthorized_receipt() -> None:
+    factories.ReceiptPDFFactory(receipt__receipt_number=None)
+
+    with pytest.raises(
+        Exception, match="Cannot generate pdf for non-authorized receipt"
+    ):
+        models.ReceiptPDF.objects.save_pdfs()
+
+    assert not models.ReceiptPDF.objects.get().pdf_file
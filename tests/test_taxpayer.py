@@ -1,13 +1,22 @@
 from __future__ import annotations
 
 from datetime import datetime
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+from unittest.mock import patch
 
 import pytest
+from cryptography import x509
 from factory.django import FileField
 from freezegun import freeze_time
 from OpenSSL import crypto
 
 from django_afip import factories
+from django_afip import models
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
 
 
 @pytest.mark.django_db
@@ -78,7 +87,7 @@ def test_certificate_object() -> None:
     taxpayer = factories.TaxPayerFactory.build()
     cert = taxpayer.certificate_object
 
-    assert isinstance(cert, crypto.X509)
+    assert isinstance(cert, x509.Certificate)
 
 
 def test_null_certificate_object() -> None:
@@ -109,3 +118,111 @@ def test_expiration_signal_update() -> None:
     expiration = taxpayer.certificate_expiration
 
     assert isinstance(expiration, datetime)
+
+
+@pytest.mark.django_db
+def test_fetch_points_of_sales(wsfe_client: MagicMock) -> None:
+    taxpayer = factories.TaxPayerFactory()
+    factories.PointOfSalesFactory(owner=taxpayer, number=1)
+    factories.PointOfSalesFactory(owner=taxpayer, number=2)
+
+    response = MagicMock(Errors=None, errorConstancia=None)
+    response.ResultGet.PtoVenta = [
+        SimpleNamespace(Nro=1, EmisionTipo="CAE", Bloqueado="N", FchBaja="NULL"),
+        SimpleNamespace(Nro=2, EmisionTipo="CAE", Bloqueado="S", FchBaja="NULL"),
+        SimpleNamespace(Nro=3, EmisionTipo="CAEA", Bloqueado="N", FchBaja="NULL"),
+        SimpleNamespace(Nro=4, EmisionTipo="CAE", Bloqueado="S", FchBaja="NULL"),
+    ]
+    wsfe_client.service.FEParamGetPtosVenta.return_value = response
+
+    results = taxpayer.fetch_points_of_sales(ticket=MagicMock())
+
+    assert [(pos.number, created) for pos, created in results] == [
+        (2, False),
+        (3, True),
+    ]
+    (updated, _), (created, _) = results
+    assert updated.blocked
+    assert updated == models.PointOfSales.objects.get(owner=taxpayer, number=2)
+    assert created.pk is not None
+    assert created == models.PointOfSales.objects.get(owner=taxpayer, number=3)
+    assert created.issuance_type == "CAEA"
+    assert not models.PointOfSales.objects.filter(owner=taxpayer, number=4).exists()
+
+
+@pytest.mark.django_db
+def test_fetch_points_of_sales_without_bulk_insert_returning(
+    wsfe_client: MagicMock,
+    no_bulk_insert_returning: None,
+) -> None:
+    taxpayer = factories.TaxPayerFactory()
+    response = MagicMock(Errors=None, errorConstancia=None)
+    response.ResultGet.PtoVenta = [
+        SimpleNamespace(Nro=3, EmisionTipo="CAEA", Bloqueado="N", FchBaja="NULL"),
+    ]
+    wsfe_client.service.FEParamGetPtosVenta.return_value = response
+
+    [(pos, created)] = taxpayer.fetch_points_of_sales(ticket=MagicMock())
+
+    assert created
+    assert pos.pk is not None
+    assert pos == models.PointOfSales.objects.get(owner=taxpayer, number=3)
+
+
+@pytest.mark.django_db
+def test_create_ticket(wsfe_client: MagicMock) -> None:
+    taxpayer = factories.TaxPayerFactory()
+    wsfe_client.service.loginCms.return_value = (
+        "<loginTicketResponse><credentials>"
+        "<token>the-token</token><sign>the-sign</sign>"
+        "</credentials></loginTicketResponse>"
+    )
+
+    with patch(
+        "django_afip.models.crypto.create_embeded_pkcs7_signature",
+        return_value=b"signed",
+    ):
+        ticket = taxpayer.create_ticket("wsfe")
+
+    ticket.refresh_from_db()
+    assert ticket.token == "the-token"
+    assert ticket.signature == "the-sign"
+
+
+@pytest.mark.django_db
+def test_key_and_certificate_bytes_close_files() -> None:
+    taxpayer = factories.TaxPayerFactory()
+    taxpayer.refresh_from_db()
+
+    assert taxpayer.key_bytes
+    assert taxpayer.certificate_bytes
+
+    assert taxpayer.key.closed
+    assert taxpayer.certificate.closed
+
+
+@pytest.mark.django_db
+def test_key_bytes_cache_is_cleared_on_save() -> None:
+    taxpayer = factories.TaxPayerFactory()
+    original = taxpayer.key_bytes
+
+    taxpayer.generate_key(force=True)
+
+    assert taxpayer.key_bytes != original
+
+
+@pytest.mark.django_db
+def test_get_any_active_ticket_fetches_owner(
+    django_assert_num_queries: Callable,
+) -> None:
+    taxpayer = factories.TaxPayerFactory()
+    models.AuthTicket.objects.create(
+        owner=taxpayer,
+        service="wsfe",
+        token="the-token",
+        signature="the-sign",
+    )
+
+    with django_assert_num_queries(1):
+        ticket = models.AuthTicket.objects.get_any_active("wsfe")
+        assert ticket.owner.cuit == taxpayer.cuit